@@ -29,7 +29,14 @@ from strategy_studio.platform_cli import (
 )
 from strategy_studio.services.backtests import BacktestRequest, execute_next_job, fetch_job, submit_backtest
 from strategy_studio.services.sync import sync_market_data
-from strategy_studio.settings import DEFAULT_JOBS, DEFAULT_LOOKBACK_DAYS, DEFAULT_VALIDATION_RATIO, DEFAULT_VALIDATION_START
+from strategy_studio.settings import (
+    DEFAULT_JOBS,
+    DEFAULT_LOOKBACK_DAYS,
+    DEFAULT_SEARCH_MODE,
+    DEFAULT_VALIDATION_RATIO,
+    DEFAULT_VALIDATION_START,
+    SEARCH_MODES,
+)
 from strategy_studio.symbols import SYMBOL_SETS, SymbolSpec
 from strategy_studio.strategy.registry import strategy_choices, strategy_display_name
 
@@ -84,6 +91,12 @@ def _add_strategy_arguments(parser: argparse.ArgumentParser) -> None:
         default="grid",
         help="策略类型，例如 grid、dca、ma_cross、macd_trend、donchian_breakout、volume_breakout、bollinger_reversion、daily_rebound、minute_rebound",
     )
+    parser.add_argument(
+        "--search-mode",
+        choices=list(SEARCH_MODES),
+        default=DEFAULT_SEARCH_MODE,
+        help="寻参方式：exhaustive 穷举全部组合，coarse_to_fine 先等距粗搜再在最优点附近细搜",
+    )
 
 
 def _add_execution_arguments(parser: argparse.ArgumentParser) -> None:
@@ -146,6 +159,7 @@ def _build_database_backtest_request(args: argparse.Namespace, symbol: str | Non
         left_side_policy=args.left_side_policy,
         force_exit_loss_pct=args.force_exit_loss_pct,
         jobs=_resolve_jobs(args.jobs),
+        search_mode=args.search_mode,
     )
 
 
@@ -116,9 +116,10 @@ def apply_qfq_segment_frame(
 
     adjust_a = normalized_segments["adjust_a"].to_numpy(dtype="float64")[positions]
     adjust_b = normalized_segments["adjust_b"].to_numpy(dtype="float64")[positions]
-    adjusted = normalized_raw.copy()
+    # normalized_raw 已是本函数私有的副本，直接原地写回复权价。
+    adjusted = normalized_raw
     # 价格列统一走 NumPy 广播，避免对千万级 K 线逐列反复触发 pandas 对齐开销。
-    price_matrix = adjusted.loc[:, PRICE_COLUMNS].apply(pd.to_numeric, errors="coerce").to_numpy(dtype="float64", copy=False)
+    price_matrix = _price_matrix(adjusted)
     adjusted_prices = price_matrix * adjust_a[:, np.newaxis] + adjust_b[:, np.newaxis]
     adjusted.loc[:, PRICE_COLUMNS] = adjusted_prices
     adjusted["AdjustA"] = adjust_a
@@ -126,6 +127,14 @@ def apply_qfq_segment_frame(
     return adjusted[["Date", "Open", "High", "Low", "Close", "Volume", "Amount", "AdjustA", "AdjustB"]]
 
 
+def _price_matrix(frame: pd.DataFrame) -> np.ndarray:
+    """取出 OHLC 浮点矩阵；数据库读出的价格列已是数值，只对非数值列做容错转换。"""
+    prices = frame.loc[:, PRICE_COLUMNS]
+    if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in prices.dtypes):
+        prices = prices.apply(pd.to_numeric, errors="coerce")
+    return prices.to_numpy(dtype="float64")
+
+
 def _normalize_raw_frame(frame: pd.DataFrame) -> pd.DataFrame:
     if frame.empty:
         return pd.DataFrame(columns=["Date", "Open", "High", "Low", "Close", "Volume", "Amount", "_date", "_date_key", "_date_ord"])
@@ -16,7 +16,6 @@ from dataclasses import dataclass
 import hashlib
 from pathlib import Path
 import re
-import struct
 
 import numpy as np
 import pandas as pd
@@ -78,6 +77,32 @@ DS_DAY_DTYPE = np.dtype(
         ("reserved", "<u4"),
     ]
 )
+LC_MINUTE_DTYPE = np.dtype(
+    [
+        ("date", "<u2"),
+        ("time", "<u2"),
+        ("open", "<f4"),
+        ("high", "<f4"),
+        ("low", "<f4"),
+        ("close", "<f4"),
+        ("amount", "<f4"),
+        ("volume", "<u4"),
+        ("reserved", "<u4"),
+    ]
+)
+LEGACY_MINUTE_DTYPE = np.dtype(
+    [
+        ("date", "<u2"),
+        ("time", "<u2"),
+        ("open", "<u4"),
+        ("high", "<u4"),
+        ("low", "<u4"),
+        ("close", "<u4"),
+        ("amount", "<f4"),
+        ("volume", "<u4"),
+        ("reserved", "<u4"),
+    ]
+)
 DS_INDEX_PREFIXES = {"31", "33", "34", "44", "62", "74", "78"}
 DS_FUND_PREFIXES = {"102"}
 DS_DERIVATIVE_PREFIXES = {"4", "5", "6", "7", "8", "67"}
@@ -295,7 +320,7 @@ def _parse_ds_day_records(raw: bytes) -> pd.DataFrame:
 
 
 def parse_minute_records(raw: bytes, suffix: str) -> pd.DataFrame:
-    """解析 `.lc1/.lc5/.1/.5` 分钟线原始记录。"""
+    """使用 NumPy 结构化视图批量解析 `.lc1/.lc5/.1/.5` 分钟线原始记录。"""
     normalized_suffix = suffix.strip().lower()
     if normalized_suffix in {".lc1", ".lc5"}:
         return _parse_lc_minute_records(raw)
@@ -305,84 +330,52 @@ def parse_minute_records(raw: bytes, suffix: str) -> pd.DataFrame:
 
 
 def _parse_lc_minute_records(raw: bytes) -> pd.DataFrame:
-    datetimes: list[str] = []
-    opens: list[float] = []
-    highs: list[float] = []
-    lows: list[float] = []
-    closes: list[float] = []
-    amounts: list[float] = []
-    volumes: list[int] = []
-    for offset in range(0, len(raw), MINUTE_RECORD_SIZE):
-        date_code, time_code, open_, high, low, close, amount, volume, _reserved = struct.unpack(
-            "<HHfffffII",
-            raw[offset : offset + MINUTE_RECORD_SIZE],
-        )
-        datetimes.append(_format_minute_datetime(date_code, time_code))
-        opens.append(float(open_))
-        highs.append(float(high))
-        lows.append(float(low))
-        closes.append(float(close))
-        amounts.append(float(amount))
-        volumes.append(int(volume))
-    return _build_minute_frame(datetimes, opens, highs, lows, closes, amounts, volumes)
+    records = np.frombuffer(raw, dtype=LC_MINUTE_DTYPE)
+    prices = {column: records[column].astype("float64") for column in ("open", "high", "low", "close")}
+    return _build_minute_frame(records, prices)
 
 
 def _parse_legacy_minute_records(raw: bytes) -> pd.DataFrame:
-    datetimes: list[str] = []
-    opens: list[float] = []
-    highs: list[float] = []
-    lows: list[float] = []
-    closes: list[float] = []
-    amounts: list[float] = []
-    volumes: list[int] = []
-    for offset in range(0, len(raw), MINUTE_RECORD_SIZE):
-        date_code, time_code, open_, high, low, close, amount, volume, _reserved = struct.unpack(
-            "<HHIIIIfII",
-            raw[offset : offset + MINUTE_RECORD_SIZE],
-        )
-        datetimes.append(_format_minute_datetime(date_code, time_code))
-        opens.append(open_ / 100)
-        highs.append(high / 100)
-        lows.append(low / 100)
-        closes.append(close / 100)
-        amounts.append(float(amount))
-        volumes.append(int(volume))
-    return _build_minute_frame(datetimes, opens, highs, lows, closes, amounts, volumes)
-
-
-def _build_minute_frame(
-    datetimes: list[str],
-    opens: list[float],
-    highs: list[float],
-    lows: list[float],
-    closes: list[float],
-    amounts: list[float],
-    volumes: list[int],
-) -> pd.DataFrame:
-    if not datetimes:
+    records = np.frombuffer(raw, dtype=LEGACY_MINUTE_DTYPE)
+    prices = {column: records[column].astype("float64") / 100 for column in ("open", "high", "low", "close")}
+    return _build_minute_frame(records, prices)
+
+
+def _build_minute_frame(records: np.ndarray, prices: dict[str, np.ndarray]) -> pd.DataFrame:
+    if len(records) == 0:
         return pd.DataFrame(columns=["open", "high", "low", "close", "amount", "volume"])
     frame = pd.DataFrame(
         {
-            "open": opens,
-            "high": highs,
-            "low": lows,
-            "close": closes,
-            "amount": amounts,
-            "volume": volumes,
+            **prices,
+            "amount": records["amount"].astype("float64"),
+            "volume": records["volume"].astype("int64"),
         }
     )
-    frame.index = pd.to_datetime(datetimes, format="%Y-%m-%d %H:%M:%S", errors="coerce")
+    frame.index = _decode_minute_datetimes(records["date"], records["time"])
     frame.index.name = "date"
     return frame
 
 
-def _format_minute_datetime(date_code: int, time_code: int) -> str:
-    year = date_code // 2048 + 2004
-    month = (date_code % 2048) // 100
-    day = (date_code % 2048) % 100
-    hour = time_code // 60
-    minute = time_code % 60
-    return f"{year:04d}-{month:02d}-{day:02d} {hour:02d}:{minute:02d}:00"
+def _decode_minute_datetimes(date_codes: np.ndarray, time_codes: np.ndarray) -> pd.DatetimeIndex:
+    """批量解码分钟线的日期/时间编码。
+
+    日期编码为 `(year - 2004) * 2048 + month * 100 + day`，时间编码为当日分钟数；
+    非法日期或超出 24 小时的时刻记为 NaT，与逐条格式化成字符串再解析的口径一致。
+    """
+    date_codes = date_codes.astype("int64")
+    time_codes = time_codes.astype("int64")
+    dates = pd.to_datetime(
+        pd.DataFrame(
+            {
+                "year": date_codes // 2048 + 2004,
+                "month": (date_codes % 2048) // 100,
+                "day": (date_codes % 2048) % 100,
+            }
+        ),
+        errors="coerce",
+    )
+    minutes = np.where(time_codes < 24 * 60, time_codes, np.nan)
+    return pd.DatetimeIndex(dates + pd.to_timedelta(minutes, unit="min"))
 
 
 def normalize_day_frame(frame: pd.DataFrame, source_file: Path, vipdoc: Path) -> pd.DataFrame:
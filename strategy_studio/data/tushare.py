@@ -9,10 +9,10 @@ from pathlib import Path
 import re
 import time
 from typing import Any
-from urllib.error import URLError
-from urllib.request import Request, urlopen
 
+import numpy as np
 import pandas as pd
+import requests
 
 from strategy_studio.db.settings import load_platform_settings
 
@@ -47,13 +47,28 @@ class TushareClientSettings:
 
 
 class TushareClient:
-    """使用 Tushare HTTP API，避免在异常里回显 token。"""
+    """使用 Tushare HTTP API，避免在异常里回显 token。
+
+    一次补数会按标的逐个调用 dividend 接口，客户端持有同一个 HTTP 会话复用连接；
+    用 `with` 包住整轮抓取，退出时统一关闭连接池。
+    """
 
     def __init__(self, settings: TushareClientSettings) -> None:
         if not settings.token:
             raise ValueError("未配置 Tushare token。请设置 STRATEGY_STUDIO_TUSHARE_TOKEN，或在配置文件中提供 tushare.token。")
         self.settings = settings
         self._last_call_at = 0.0
+        self._http = requests.Session()
+        self._http.headers.update({"Content-Type": "application/json"})
+
+    def __enter__(self) -> TushareClient:
+        return self
+
+    def __exit__(self, *_exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._http.close()
 
     def query(
         self,
@@ -79,15 +94,10 @@ class TushareClient:
         for attempt in range(max(self.settings.retries, 1)):
             self._throttle()
             try:
-                request = Request(
-                    TUSHARE_API_URL,
-                    data=body,
-                    headers={"Content-Type": "application/json"},
-                    method="POST",
-                )
-                with urlopen(request, timeout=self.settings.timeout_seconds) as response:
-                    return json.loads(response.read().decode("utf-8"))
-            except (OSError, URLError, json.JSONDecodeError) as exc:
+                response = self._http.post(TUSHARE_API_URL, data=body, timeout=self.settings.timeout_seconds)
+                response.raise_for_status()
+                return json.loads(response.content.decode("utf-8"))
+            except (OSError, requests.RequestException, json.JSONDecodeError) as exc:
                 last_error = exc
                 time.sleep(min(2**attempt, 8))
         raise RuntimeError(f"Tushare 请求失败：{last_error}") from last_error
@@ -173,8 +183,16 @@ def build_corporate_action_records(frame: pd.DataFrame) -> list[dict[str, object
     if normalized.empty:
         return []
 
+    cash_dividends = _to_float_column(normalized, "cash_div_tax", "cash_div", 0.0)
+    stock_bonus_ratios = _to_float_column(normalized, "stk_bo_rate", None, 0.0)
+    stock_conversion_ratios = _to_float_column(normalized, "stk_co_rate", None, 0.0)
     rows: list[dict[str, object]] = []
-    for item in normalized.to_dict(orient="records"):
+    for item, cash_dividend, stock_bonus_ratio, stock_conversion_ratio in zip(
+        normalized.to_dict(orient="records"),
+        cash_dividends,
+        stock_bonus_ratios,
+        stock_conversion_ratios,
+    ):
         ts_code = str(item["ts_code"]).upper()
         rows.append(
             {
@@ -185,9 +203,9 @@ def build_corporate_action_records(frame: pd.DataFrame) -> list[dict[str, object
                 "ex_date": _parse_date(item.get("ex_date")),
                 "pay_date": _parse_date(item.get("pay_date")),
                 "end_date": _parse_date(item.get("end_date")),
-                "cash_dividend": _to_float(item.get("cash_div_tax"), item.get("cash_div"), 0.0),
-                "stock_bonus_ratio": _to_float(item.get("stk_bo_rate"), "", 0.0),
-                "stock_conversion_ratio": _to_float(item.get("stk_co_rate"), "", 0.0),
+                "cash_dividend": cash_dividend,
+                "stock_bonus_ratio": stock_bonus_ratio,
+                "stock_conversion_ratio": stock_conversion_ratio,
                 "rights_ratio": 0.0,
                 "rights_price": 0.0,
                 "status": _normalize_action_status(item.get("div_proc"), ex_date=item.get("ex_date")),
@@ -281,3 +299,18 @@ def _to_float(primary: object, secondary: object, default: float) -> float:
         if text:
             return float(text)
     return default
+
+
+def _to_float_column(frame: pd.DataFrame, primary: str, secondary: str | None, default: float) -> list[float]:
+    """按列批量转浮点，口径与 `_to_float` 一致：主列为空回退次列，都为空取默认值。
+
+    调用方传入的是 `normalize_dividend_frame` 已去空白的字符串列，空串判断和
+    字符串转浮点都在 NumPy 里整列完成，非法数字同样抛出 ValueError。
+    """
+    text = frame[primary].to_numpy(dtype=object)
+    if secondary is not None:
+        text = np.where(text != "", text, frame[secondary].to_numpy(dtype=object))
+    filled = text != ""
+    values = np.full(len(text), default, dtype="float64")
+    values[filled] = text[filled].astype("float64")
+    return values.tolist()
@@ -2,13 +2,15 @@ from __future__ import annotations
 
 """行情仓储。"""
 
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
 from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime
+from threading import Lock
 
+import numpy as np
 import pandas as pd
-from sqlalchemy import BOOLEAN, Select, func, literal_column, select
+from sqlalchemy import BOOLEAN, func, literal_column, select
 from sqlalchemy import delete
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session
@@ -75,6 +77,86 @@ class BacktestPriceFrameSnapshot:
     series_id: int | None
 
 
+# 回测 worker 常在同一进程里对同一标的连续跑多个策略/参数模板。这里按筛选条件缓存
+# 已构建好的行情 DataFrame，每次读取前用一条聚合查询核对新鲜度，避免重复水合 ORM 行。
+# 分钟线一份就可能数十 MB，除了份数上限还按 DataFrame 实际占用的内存做预算淘汰。
+_PRICE_FRAME_CACHE_LIMIT = 16
+_PRICE_FRAME_CACHE_MAX_BYTES = 256 * 1024 * 1024
+_PRICE_FRAME_CACHE: OrderedDict[tuple[object, ...], tuple[tuple[object, ...], pd.DataFrame, int]] = OrderedDict()
+_PRICE_FRAME_CACHE_BYTES = 0
+_PRICE_FRAME_CACHE_LOCK = Lock()
+
+
+_PRICE_FRAME_DTYPES: dict[str, object] = {
+    "Date": "datetime64[ns]",
+    "Open": np.float64,
+    "High": np.float64,
+    "Low": np.float64,
+    "Close": np.float64,
+    "Volume": np.int64,
+}
+
+
+def _build_backtest_price_frame(rows: Iterable[object]) -> pd.DataFrame:
+    """把按时间升序的 `(bar_time, open, high, low, close, volume)` 行直接构造成回测行情。"""
+    frame = pd.DataFrame.from_records(rows, columns=list(_PRICE_FRAME_DTYPES))
+    return frame.astype(_PRICE_FRAME_DTYPES).set_index("Date")
+
+
+def clear_price_frame_cache() -> None:
+    """清空进程内回测行情缓存。"""
+    global _PRICE_FRAME_CACHE_BYTES
+    with _PRICE_FRAME_CACHE_LOCK:
+        _PRICE_FRAME_CACHE.clear()
+        _PRICE_FRAME_CACHE_BYTES = 0
+
+
+def _load_bar_range_token(
+    session: Session,
+    model: type[PriceBar] | type[MarketDataBar],
+    conditions: list[object],
+    revision: object,
+) -> tuple[object, ...]:
+    """读取筛选区间的条数、最新 K 线时间和所属序列的写入戳，作为缓存新鲜度标记。
+
+    `revision` 是父表上由每次 upsert 重新赋值的写入时间（`MarketDataSeries.last_ingested_at`
+    或 `Instrument.updated_at`）。缓存只比较相等而不比较大小，写入事务无论多晚提交，
+    提交后都会换成一个新值；不再取 K 线行的 `max(ingested_at)`，因为更新行用的是事务
+    开始时间，长事务晚提交时可能不超过已有的最大值。
+    """
+    statement = select(func.count(), func.max(model.bar_time), revision).where(*conditions)
+    return tuple(session.execute(statement).one())
+
+
+def _get_cached_price_frame(cache_key: tuple[object, ...], token: tuple[object, ...]) -> pd.DataFrame | None:
+    with _PRICE_FRAME_CACHE_LOCK:
+        cached = _PRICE_FRAME_CACHE.get(cache_key)
+        if cached is None or cached[0] != token:
+            return None
+        _PRICE_FRAME_CACHE.move_to_end(cache_key)
+        return cached[1]
+
+
+def _store_cached_price_frame(cache_key: tuple[object, ...], token: tuple[object, ...], frame: pd.DataFrame) -> None:
+    global _PRICE_FRAME_CACHE_BYTES
+    frame_bytes = int(frame.memory_usage(index=True, deep=True).sum())
+    with _PRICE_FRAME_CACHE_LOCK:
+        previous = _PRICE_FRAME_CACHE.pop(cache_key, None)
+        if previous is not None:
+            _PRICE_FRAME_CACHE_BYTES -= previous[2]
+        # 单份就超过预算的行情不进缓存，否则会把其余条目全部挤掉。
+        if frame_bytes > _PRICE_FRAME_CACHE_MAX_BYTES:
+            return
+        _PRICE_FRAME_CACHE[cache_key] = (token, frame, frame_bytes)
+        _PRICE_FRAME_CACHE_BYTES += frame_bytes
+        while (
+            len(_PRICE_FRAME_CACHE) > _PRICE_FRAME_CACHE_LIMIT
+            or _PRICE_FRAME_CACHE_BYTES > _PRICE_FRAME_CACHE_MAX_BYTES
+        ):
+            _, (_, _, evicted_bytes) = _PRICE_FRAME_CACHE.popitem(last=False)
+            _PRICE_FRAME_CACHE_BYTES -= evicted_bytes
+
+
 def _build_series_metadata_summary(metadata_json: dict[str, object] | None) -> dict[str, object]:
     metadata = dict(metadata_json or {})
     return {
@@ -401,6 +483,44 @@ def get_or_create_market_data_series(
     return series
 
 
+def _frame_bar_times(frame: pd.DataFrame) -> list[datetime]:
+    """把 `Date` 列整列转成去掉时区的 Python datetime。"""
+    dates = pd.to_datetime(frame["Date"]).dt.tz_localize(None)
+    return list(pd.DatetimeIndex(dates).to_pydatetime())
+
+
+def _float_column(frame: pd.DataFrame, column: str) -> list[float]:
+    """整列转 float64 后一次性转回 Python float，避免按行装箱再逐格转换。
+
+    整列转换会把对象列里的 None 静默变成 NaN，而 K 线价格列不允许为空，
+    这里对缺失和非有限值直接报错，不让 NaN 写进数据库。
+    """
+    values = frame[column].to_numpy(dtype=np.float64)
+    invalid_positions = np.flatnonzero(~np.isfinite(values))
+    if invalid_positions.size:
+        first_position = int(invalid_positions[0])
+        raise ValueError(
+            f"K 线 {column} 列存在缺失或非有限价格: 共 {invalid_positions.size} 行，"
+            f"首行 {frame.index[first_position]} 的值为 {frame[column].iloc[first_position]!r}"
+        )
+    return values.tolist()
+
+
+def _int_column(frame: pd.DataFrame, column: str) -> list[int]:
+    values = frame[column].to_numpy()
+    if values.dtype.kind in "iu":
+        return values.astype(np.int64).tolist()
+    # 浮点或对象列保留 int() 的截断和报错口径，例如 NaN 成交量仍然直接报错。
+    return [int(value) for value in values.tolist()]
+
+
+def _optional_float_column(frame: pd.DataFrame, column: str) -> list[float | None]:
+    values = frame[column].to_numpy()
+    if values.dtype.kind == "f":
+        return values.astype(np.float64).tolist()
+    return [float(value) if value is not None else None for value in values.tolist()]
+
+
 def upsert_price_frame(
     session: Session,
     instrument: Instrument,
@@ -412,9 +532,10 @@ def upsert_price_frame(
     if frame.empty:
         return 0, 0
 
-    normalized = frame.copy()
-    normalized["Date"] = pd.to_datetime(normalized["Date"]).dt.tz_localize(None)
-    timestamps = [item.to_pydatetime() for item in normalized["Date"].tolist()]
+    timestamps = _frame_bar_times(frame)
+    open_prices, high_prices, low_prices, close_prices = (
+        _float_column(frame, column) for column in ("Open", "High", "Low", "Close")
+    )
     existing: set[datetime] = set()
     for batch in _chunked(timestamps):
         rows = session.scalars(
@@ -430,16 +551,23 @@ def upsert_price_frame(
         {
             "instrument_id": instrument.id,
             "interval": interval,
-            "bar_time": item["Date"].to_pydatetime() if hasattr(item["Date"], "to_pydatetime") else item["Date"],
-            "open": float(item["Open"]),
-            "high": float(item["High"]),
-            "low": float(item["Low"]),
-            "close": float(item["Close"]),
-            "adj_close": float(item["Close"]),
-            "volume": int(item["Volume"]),
+            "bar_time": bar_time,
+            "open": open_price,
+            "high": high_price,
+            "low": low_price,
+            "close": close_price,
+            "adj_close": close_price,
+            "volume": volume,
             "source": source,
         }
-        for item in normalized.to_dict(orient="records")
+        for bar_time, open_price, high_price, low_price, close_price, volume in zip(
+            timestamps,
+            open_prices,
+            high_prices,
+            low_prices,
+            close_prices,
+            _int_column(frame, "Volume"),
+        )
     ]
     for row_batch in _chunked(all_rows, size=1500):
         statement = insert(PriceBar).values(row_batch)
@@ -459,6 +587,8 @@ def upsert_price_frame(
                 set_=update_columns,
             )
         )
+    # 回测行情缓存以标的的 updated_at 作为写入戳，每次写入都要重新赋值。
+    instrument.updated_at = utc_now()
     updated_count = len(existing)
     inserted_count = len(all_rows) - updated_count
     return inserted_count, updated_count
@@ -473,24 +603,34 @@ def upsert_market_data_frame(
     if frame.empty:
         return 0, 0
 
-    normalized = frame.copy()
-    normalized["Date"] = pd.to_datetime(normalized["Date"]).dt.tz_localize(None)
-    timestamps = [item.to_pydatetime() for item in normalized["Date"].tolist()]
+    timestamps = _frame_bar_times(frame)
+    open_prices, high_prices, low_prices, close_prices = (
+        _float_column(frame, column) for column in ("Open", "High", "Low", "Close")
+    )
+    turnover_amounts = _optional_float_column(frame, "Amount") if "Amount" in frame.columns else [None] * len(frame)
     all_rows = [
         {
             "series_id": series.id,
-            "bar_time": item["Date"].to_pydatetime() if hasattr(item["Date"], "to_pydatetime") else item["Date"],
-            "open": float(item["Open"]),
-            "high": float(item["High"]),
-            "low": float(item["Low"]),
-            "close": float(item["Close"]),
-            "adj_close": float(item["Close"]),
-            "volume": int(item["Volume"]),
-            "turnover_amount": float(item["Amount"]) if "Amount" in item and item["Amount"] is not None else None,
+            "bar_time": bar_time,
+            "open": open_price,
+            "high": high_price,
+            "low": low_price,
+            "close": close_price,
+            "adj_close": close_price,
+            "volume": volume,
+            "turnover_amount": turnover_amount,
             "data_status": "ready",
             "payload_json": {},
         }
-        for item in normalized.to_dict(orient="records")
+        for bar_time, open_price, high_price, low_price, close_price, volume, turnover_amount in zip(
+            timestamps,
+            open_prices,
+            high_prices,
+            low_prices,
+            close_prices,
+            _int_column(frame, "Volume"),
+            turnover_amounts,
+        )
     ]
     inserted_count = 0
     updated_count = 0
@@ -1718,35 +1858,30 @@ def load_price_frame_from_database(
     if instrument is None:
         raise ValueError(f"数据库中不存在该标的: {symbol}")
 
-    statement: Select[tuple[PriceBar]] = (
-        select(PriceBar)
-        .where(PriceBar.instrument_id == instrument.id, PriceBar.interval == interval)
-        .order_by(PriceBar.bar_time)
-    )
+    conditions: list[object] = [PriceBar.instrument_id == instrument.id, PriceBar.interval == interval]
     if start:
-        statement = statement.where(PriceBar.bar_time >= pd.Timestamp(start).to_pydatetime())
+        conditions.append(PriceBar.bar_time >= pd.Timestamp(start).to_pydatetime())
     if end:
-        statement = statement.where(PriceBar.bar_time <= pd.Timestamp(end).to_pydatetime())
-
-    rows = session.scalars(statement).all()
-    if not rows:
-        raise ValueError(f"数据库中没有可用于回测的行情: symbol={symbol} interval={interval}")
-    frame = pd.DataFrame(
-        [
-            {
-                "Date": row.bar_time,
-                "Open": row.open,
-                "High": row.high,
-                "Low": row.low,
-                "Close": row.close,
-                "Volume": row.volume,
-            }
-            for row in rows
-        ]
-    )
-    frame["Date"] = pd.to_datetime(frame["Date"])
+        conditions.append(PriceBar.bar_time <= pd.Timestamp(end).to_pydatetime())
+
+    cache_key = ("price_bars", instrument.id, interval, start, end)
+    revision = select(Instrument.updated_at).where(Instrument.id == instrument.id).scalar_subquery()
+    token = _load_bar_range_token(session, PriceBar, conditions, revision)
+    frame = _get_cached_price_frame(cache_key, token)
+    if frame is None:
+        # 只取回测需要的列，不再水合整行 ORM 实体。
+        statement = (
+            select(PriceBar.bar_time, PriceBar.open, PriceBar.high, PriceBar.low, PriceBar.close, PriceBar.volume)
+            .where(*conditions)
+            .order_by(PriceBar.bar_time)
+        )
+        rows = session.execute(statement).all()
+        if not rows:
+            raise ValueError(f"数据库中没有可用于回测的行情: symbol={symbol} interval={interval}")
+        frame = _build_backtest_price_frame(rows)
+        _store_cached_price_frame(cache_key, token, frame)
     return BacktestPriceFrameSnapshot(
-        frame=frame.sort_values("Date").set_index("Date"),
+        frame=frame.copy(),
         source_label=f"database://price_bars/{symbol.upper()}/{interval}",
         source_kind="legacy_price_bars",
         provider_key="yahoo",
@@ -1818,40 +1953,42 @@ def load_backtest_price_frame_from_database(
 
     selected_series = filtered_candidates[0]
     series_id = int(selected_series["series_id"])
-    statement = (
-        select(MarketDataBar)
-        .where(MarketDataBar.series_id == series_id)
-        .order_by(MarketDataBar.bar_time)
-    )
+    conditions: list[object] = [MarketDataBar.series_id == series_id]
     if start:
-        statement = statement.where(MarketDataBar.bar_time >= pd.Timestamp(start).to_pydatetime())
+        conditions.append(MarketDataBar.bar_time >= pd.Timestamp(start).to_pydatetime())
     if end:
-        statement = statement.where(MarketDataBar.bar_time <= pd.Timestamp(end).to_pydatetime())
-    rows = session.scalars(statement).all()
-    if not rows:
-        raise ValueError(
-            "统一行情序列存在，但当前筛选范围没有可用于回测的 K 线: "
-            f"symbol={symbol} interval={interval} series_id={series_id}"
+        conditions.append(MarketDataBar.bar_time <= pd.Timestamp(end).to_pydatetime())
+
+    cache_key = ("market_data_bars", series_id, start, end)
+    revision = select(MarketDataSeries.last_ingested_at).where(MarketDataSeries.id == series_id).scalar_subquery()
+    token = _load_bar_range_token(session, MarketDataBar, conditions, revision)
+    frame = _get_cached_price_frame(cache_key, token)
+    if frame is None:
+        # payload_json 等宽列对回测无用，只取 OHLCV。
+        statement = (
+            select(
+                MarketDataBar.bar_time,
+                MarketDataBar.open,
+                MarketDataBar.high,
+                MarketDataBar.low,
+                MarketDataBar.close,
+                MarketDataBar.volume,
+            )
+            .where(*conditions)
+            .order_by(MarketDataBar.bar_time)
         )
-
-    frame = pd.DataFrame(
-        [
-            {
-                "Date": row.bar_time,
-                "Open": row.open,
-                "High": row.high,
-                "Low": row.low,
-                "Close": row.close,
-                "Volume": row.volume,
-            }
-            for row in rows
-        ]
-    )
-    frame["Date"] = pd.to_datetime(frame["Date"])
+        rows = session.execute(statement).all()
+        if not rows:
+            raise ValueError(
+                "统一行情序列存在，但当前筛选范围没有可用于回测的 K 线: "
+                f"symbol={symbol} interval={interval} series_id={series_id}"
+            )
+        frame = _build_backtest_price_frame(rows)
+        _store_cached_price_frame(cache_key, token, frame)
     resolved_provider = str(selected_series.get("provider_key") or "")
     resolved_adjustment = str(selected_series.get("adjustment_kind") or "")
     return BacktestPriceFrameSnapshot(
-        frame=frame.sort_values("Date").set_index("Date"),
+        frame=frame.copy(),
         source_label=(
             "database://market_data_series/"
             f"{resolved_provider}/{symbol.upper()}/{interval}/{resolved_adjustment or 'raw'}"
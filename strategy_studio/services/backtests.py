@@ -29,8 +29,9 @@ from strategy_studio.repositories.market_data import (
     get_instrument_by_symbol,
     load_backtest_price_frame_from_database,
 )
-from strategy_studio.settings import build_execution_config
+from strategy_studio.settings import DEFAULT_SEARCH_MODE, build_execution_config
 from strategy_studio.services.templates import resolve_backtest_request_payload
+from strategy_studio.strategy.sampling import format_timestamp, resolve_sample_start
 from strategy_studio.workflow import run_full_workflow, run_minute_full_workflow
 
 
@@ -57,6 +58,7 @@ class BacktestRequest:
     template_id: int | None = None
     template_snapshot: dict[str, object] | None = None
     parameter_space: dict[str, object] | None = None
+    search_mode: str | None = None
 
 
 def _is_intraday(interval: str) -> bool:
@@ -450,10 +452,18 @@ def execute_next_job(
             )
             session.commit()
 
+            # 日线工作流只使用样本内起点之后的行情，起点直接下推到数据库查询；
+            # 分钟线按比例切分样本，仍需读取全部 K 线。
+            price_start = (
+                None
+                if _is_intraday(payload.interval)
+                else format_timestamp(resolve_sample_start(payload.validation_start, payload.lookback_days))
+            )
             price_snapshot = load_backtest_price_frame_from_database(
                 session,
                 payload.symbol,
                 payload.interval,
+                start=price_start,
                 provider_key=payload.market_data_provider,
                 adjustment_kind=payload.market_data_adjustment_kind,
             )
@@ -500,6 +510,7 @@ def execute_next_job(
                     jobs=effective_parallelism,
                     parameter_space=payload.parameter_space,
                     data=price_frame,
+                    search_mode=payload.search_mode or DEFAULT_SEARCH_MODE,
                 )
                 if _is_intraday(payload.interval)
                 else run_full_workflow(
@@ -512,6 +523,7 @@ def execute_next_job(
                     jobs=effective_parallelism,
                     parameter_space=payload.parameter_space,
                     data=price_frame,
+                    search_mode=payload.search_mode or DEFAULT_SEARCH_MODE,
                 )
             )
             if _cancel_if_requested(session, job):
@@ -2043,10 +2043,8 @@ def _sync_tushare_corporate_actions(
     target_symbols: list[str] | None = None,
     requested_via: str | None = None,
 ) -> dict[str, object]:
-    client = TushareClient(load_tushare_client_settings())
-    targets = _resolve_tushare_targets(client, symbol=symbol, limit=limit, target_symbols=target_symbols)
-
-    with open_session() as session:
+    with TushareClient(load_tushare_client_settings()) as client, open_session() as session:
+        targets = _resolve_tushare_targets(client, symbol=symbol, limit=limit, target_symbols=target_symbols)
         provider = ensure_data_provider(
             session,
             provider_key="tushare",
@@ -37,6 +37,7 @@ from strategy_studio.settings import (
     DAILY_SPACINGS,
     DAILY_TAKE_PROFITS,
     DEFAULT_LOOKBACK_DAYS,
+    DEFAULT_SEARCH_MODE,
     DEFAULT_VALIDATION_RATIO,
     DEFAULT_VALIDATION_START,
     INTRADAY_GRID_COUNTS,
@@ -50,6 +51,7 @@ from strategy_studio.settings import (
     MINUTE_REBOUND_RSI_ENTRIES,
     MINUTE_REBOUND_STOP_LOSSES,
     MINUTE_REBOUND_TAKE_PROFITS,
+    SEARCH_MODES,
     StrategyKind,
     default_execution_config,
 )
@@ -592,6 +594,9 @@ def resolve_backtest_request_payload(request: Any, session: Session) -> dict[str
         getattr(request, "parameter_space", None) if getattr(request, "parameter_space", None) is not None else (template.parameter_space_json if template else None),
         interval,
     )
+    search_mode = str(getattr(request, "search_mode", None) or DEFAULT_SEARCH_MODE).strip().lower()
+    if search_mode not in SEARCH_MODES:
+        raise ValueError(f"search_mode 仅支持 {', '.join(SEARCH_MODES)}。")
 
     merged = {
         "symbol": symbol,
@@ -619,6 +624,7 @@ def resolve_backtest_request_payload(request: Any, session: Session) -> dict[str
         "template_id": template.id if template else None,
         "template_snapshot": _template_snapshot(template) if template else None,
         "parameter_space": parameter_space,
+        "search_mode": search_mode,
     }
     if merged["jobs"] <= 0:
         raise ValueError("jobs 必须是正整数。")
@@ -16,6 +16,7 @@ WorkflowMode = Literal["daily", "intraday"]
 ExecutionProfile = Literal["research", "realistic"]
 GridMode = Literal["cash"]
 LeftSidePolicy = Literal["hold", "force_exit", "both"]
+SearchMode = Literal["exhaustive", "coarse_to_fine"]
 StrategyKind = Literal[
     "grid",
     "dca",
@@ -36,6 +37,8 @@ DEFAULT_VALIDATION_RATIO = 0.25
 DEFAULT_WALK_FORWARD_WINDOW_COUNT = 3
 DEFAULT_WALK_FORWARD_MIN_WINDOW_SIZE = 20
 DEFAULT_JOBS = 8
+DEFAULT_SEARCH_MODE: SearchMode = "exhaustive"
+SEARCH_MODES: tuple[SearchMode, ...] = ("exhaustive", "coarse_to_fine")
 
 DAILY_SPACINGS = (0.03, 0.04, 0.05, 0.06, 0.07)
 DAILY_GRID_COUNTS = (4, 5, 6, 7)
@@ -25,7 +25,7 @@ from strategy_studio.settings import (
     build_execution_config,
 )
 from strategy_studio.strategy.metrics import compute_rebound_score, summarize_walk_forward_runs
-from strategy_studio.strategy.sampling import build_walk_forward_windows, format_timestamp
+from strategy_studio.strategy.sampling import build_walk_forward_windows, format_timestamp, format_timestamp_index
 
 
 TOTAL_CAPITAL = 200000.0
@@ -115,12 +115,10 @@ def _prepare_features(data: pd.DataFrame, ma_window: int, band_width: float) ->
     return frame
 
 
-def _build_equity_curve(history_rows: list[dict[str, object]]) -> pd.DataFrame:
-    frame = pd.DataFrame(history_rows)
-    if frame.empty:
+def _build_equity_curve(index: pd.DatetimeIndex, equity: np.ndarray) -> pd.DataFrame:
+    if len(equity) == 0:
         return pd.DataFrame()
-    frame["Date"] = pd.to_datetime(frame["Date"])
-    curve = frame.set_index("Date")[["Equity"]].copy()
+    curve = pd.DataFrame({"Equity": equity}, index=pd.DatetimeIndex(np.asarray(index, dtype="datetime64[ns]"), name="Date"))
     curve["PeakEquity"] = curve["Equity"].cummax()
     curve["DrawdownPct"] = np.where(curve["PeakEquity"] > 0, curve["Equity"] / curve["PeakEquity"] - 1, 0.0)
     return curve
@@ -177,17 +175,33 @@ def run_bollinger_reversion_backtest(
 
     trade_rows: list[dict[str, object]] = []
     event_rows: list[dict[str, object]] = []
-    history_rows: list[dict[str, object]] = []
     annual_factor = _annualization_factor(frame.index)
     max_position_capital = total_capital * max(execution.max_position_ratio, 0.0)
     param_signature = json.dumps(params, ensure_ascii=False, sort_keys=True, default=str)
 
-    for timestamp, row in frame.iterrows():
-        close_price = float(row["Close"])
-        middle_band = row["MiddleBand"]
-        lower_band = row["LowerBand"]
-        upper_band = row["UpperBand"]
-        rsi = float(row["RSI"]) if pd.notna(row["RSI"]) else 50.0
+    # 布林带与 RSI 先取成数组，账户状态逐根写进预分配数组，循环结束后整列生成明细。
+    close_values = frame["Close"].to_numpy(dtype=np.float64)
+    middle_band_values = frame["MiddleBand"].to_numpy(dtype=np.float64)
+    lower_band_values = frame["LowerBand"].to_numpy(dtype=np.float64)
+    upper_band_values = frame["UpperBand"].to_numpy(dtype=np.float64)
+    rsi_values = frame["RSI"].to_numpy(dtype=np.float64)
+    bar_count = len(frame)
+    position_units_values = np.zeros(bar_count, dtype=np.int64)
+    entry_price_values = np.zeros(bar_count, dtype=np.float64)
+    entry_cost_values = np.zeros(bar_count, dtype=np.float64)
+    realized_profit_values = np.zeros(bar_count, dtype=np.float64)
+    market_value_values = np.zeros(bar_count, dtype=np.float64)
+    position_ratio_values = np.zeros(bar_count, dtype=np.float64)
+    max_position_ratio_values = np.zeros(bar_count, dtype=np.float64)
+    transaction_cost_values = np.zeros(bar_count, dtype=np.float64)
+    slippage_cost_values = np.zeros(bar_count, dtype=np.float64)
+    equity_values = np.zeros(bar_count, dtype=np.float64)
+
+    for index, timestamp in enumerate(frame.index):
+        close_price = float(close_values[index])
+        middle_band = middle_band_values[index]
+        lower_band = lower_band_values[index]
+        rsi = float(rsi_values[index]) if pd.notna(rsi_values[index]) else 50.0
 
         if position_units > 0:
             hold_bars += 1
@@ -315,41 +329,50 @@ def run_bollinger_reversion_backtest(
         max_drawdown_pct = min(max_drawdown_pct, drawdown_pct)
         position_ratio = market_value / total_capital if total_capital else 0.0
         max_position_ratio_used = max(max_position_ratio_used, position_ratio)
-        unrealized_pnl = position_units * (close_price - entry_execution_price) if position_units > 0 else 0.0
 
-        history_rows.append(
-            {
-                "Date": format_timestamp(timestamp),
-                "Close": close_price,
-                "MiddleBand": float(middle_band) if pd.notna(middle_band) else 0.0,
-                "LowerBand": float(lower_band) if pd.notna(lower_band) else 0.0,
-                "UpperBand": float(upper_band) if pd.notna(upper_band) else 0.0,
-                "RSI": rsi,
-                "PositionUnits": position_units,
-                "OpenGridLevels": 1 if position_units > 0 else 0,
-                "GrossCost": position_units * entry_execution_price + entry_cost if position_units > 0 else 0.0,
-                "RealizedGridProfit": realized_profit,
-                "ClosedGridNetProfit": realized_profit,
-                "UnrealizedPnl": unrealized_pnl,
-                "EffectiveCost": entry_execution_price if position_units > 0 else 0.0,
-                "CostReductionPct": 0.0,
-                "MarketValue": market_value,
-                "OpenGridMarketValue": market_value,
-                "PositionRatioPct": position_ratio * 100,
-                "MaxCapitalUsedPct": max_position_ratio_used * 100,
-                "TransactionCostCumulative": transaction_cost_total,
-                "SlippageCostCumulative": slippage_cost_total,
-                "MaxPositionRatioUsedPct": max_position_ratio_used * 100,
-                "Equity": equity,
-            }
-        )
+        position_units_values[index] = position_units
+        entry_price_values[index] = entry_execution_price
+        entry_cost_values[index] = entry_cost
+        realized_profit_values[index] = realized_profit
+        market_value_values[index] = market_value
+        position_ratio_values[index] = position_ratio
+        max_position_ratio_values[index] = max_position_ratio_used
+        transaction_cost_values[index] = transaction_cost_total
+        slippage_cost_values[index] = slippage_cost_total
+        equity_values[index] = equity
         if cooldown_remaining > 0:
             cooldown_remaining -= 1
 
-    history = pd.DataFrame(history_rows)
+    holding = position_units_values > 0
+    history = pd.DataFrame(
+        {
+            "Date": format_timestamp_index(frame.index),
+            "Close": close_values,
+            "MiddleBand": np.where(np.isnan(middle_band_values), 0.0, middle_band_values),
+            "LowerBand": np.where(np.isnan(lower_band_values), 0.0, lower_band_values),
+            "UpperBand": np.where(np.isnan(upper_band_values), 0.0, upper_band_values),
+            "RSI": np.where(np.isnan(rsi_values), 50.0, rsi_values),
+            "PositionUnits": position_units_values,
+            "OpenGridLevels": holding.astype(np.int64),
+            "GrossCost": np.where(holding, position_units_values * entry_price_values + entry_cost_values, 0.0),
+            "RealizedGridProfit": realized_profit_values,
+            "ClosedGridNetProfit": realized_profit_values,
+            "UnrealizedPnl": np.where(holding, position_units_values * (close_values - entry_price_values), 0.0),
+            "EffectiveCost": np.where(holding, entry_price_values, 0.0),
+            "CostReductionPct": np.zeros(bar_count, dtype=np.float64),
+            "MarketValue": market_value_values,
+            "OpenGridMarketValue": market_value_values,
+            "PositionRatioPct": position_ratio_values * 100,
+            "MaxCapitalUsedPct": max_position_ratio_values * 100,
+            "TransactionCostCumulative": transaction_cost_values,
+            "SlippageCostCumulative": slippage_cost_values,
+            "MaxPositionRatioUsedPct": max_position_ratio_values * 100,
+            "Equity": equity_values,
+        }
+    )
     events = pd.DataFrame(event_rows)
     trades = pd.DataFrame(trade_rows)
-    equity_curve = _build_equity_curve(history_rows)
+    equity_curve = _build_equity_curve(frame.index, equity_values)
     final_equity = float(history.iloc[-1]["Equity"]) if not history.empty else total_capital
     return_pct = (final_equity / total_capital - 1) * 100 if total_capital else 0.0
     benchmark_metrics = _build_benchmark_metrics(frame, total_capital, lot_size, execution)
@@ -20,8 +20,9 @@ from strategy_studio.settings import (
     ExecutionConfig,
     build_execution_config,
 )
+from strategy_studio.strategy.kernels import parallel_threads, simulate_dca, sweep_dca_windows
 from strategy_studio.strategy.metrics import compute_robust_score
-from strategy_studio.strategy.sampling import build_walk_forward_windows, format_timestamp
+from strategy_studio.strategy.sampling import build_walk_forward_bounds, format_timestamp, format_timestamp_index
 
 
 TOTAL_CAPITAL = 200000.0
@@ -63,13 +64,12 @@ def _affordable_units(cash_budget: float, close_price: float, lot_size: int, exe
 
 
 def _build_benchmark_metrics(
-    data: pd.DataFrame,
+    entry_price: float,
+    final_price: float,
     total_capital: float,
     lot_size: int,
     execution: ExecutionConfig,
 ) -> dict[str, float | int]:
-    entry_price = float(data.iloc[0]["Close"])
-    final_price = float(data.iloc[-1]["Close"])
     buy_hold_units = _affordable_units(total_capital, entry_price, lot_size, execution)
     buy_hold_cash_used = buy_hold_units * _buy_cash_required_per_unit(entry_price, execution)
     buy_hold_equity = total_capital - buy_hold_cash_used + buy_hold_units * final_price
@@ -83,40 +83,73 @@ def _build_benchmark_metrics(
     }
 
 
-def _period_key(timestamp: pd.Timestamp, frequency: str) -> tuple[int, int]:
+def _prepare_dca_frame(data: pd.DataFrame) -> pd.DataFrame:
+    """统一成按时间升序的 DatetimeIndex；已经满足时直接复用，不再复制。"""
+    frame = data
+    if not isinstance(frame.index, pd.DatetimeIndex):
+        frame = frame.set_axis(pd.to_datetime(frame.index))
+    if not frame.index.is_monotonic_increasing:
+        frame = frame.sort_index()
+    return frame
+
+
+def _period_keys(index: pd.DatetimeIndex, frequency: str) -> np.ndarray:
+    """把每个交易日映射成 `年 * 100 + 周/月` 的整数周期键。"""
     if frequency == "weekly":
-        calendar = timestamp.isocalendar()
-        return int(calendar.year), int(calendar.week)
+        calendar = index.isocalendar()
+        return calendar["year"].to_numpy(dtype=np.int64) * 100 + calendar["week"].to_numpy(dtype=np.int64)
     if frequency == "monthly":
-        return timestamp.year, timestamp.month
+        return index.year.to_numpy(dtype=np.int64) * 100 + index.month.to_numpy(dtype=np.int64)
     raise ValueError(f"dca frequency 仅支持 weekly/monthly，当前值为 {frequency}")
 
 
-def _build_dca_schedule(index: pd.DatetimeIndex, frequency: str, day_rule: str) -> set[pd.Timestamp]:
-    """按真实可交易日生成定投触发点。
+def _require_supported_day_rule(day_rule: str) -> None:
+    """单次回测和稳健性窗口共用同一套触发日规则校验。"""
+    if day_rule != "first_trading_day":
+        raise ValueError(f"dca day_rule 仅支持 first_trading_day，当前值为 {day_rule}")
+
+
+def _build_dca_schedule(index: pd.DatetimeIndex, frequency: str, day_rule: str) -> np.ndarray:
+    """按真实可交易日生成定投触发点，返回触发日在 `index` 中的整数位置。
 
     当前只实现每个周期第一个交易日。这样不会假设自然日一定开市，也能覆盖
     港股、美股、A 股 ETF 的节假日缺口。
     """
-    if day_rule != "first_trading_day":
-        raise ValueError(f"dca day_rule 仅支持 first_trading_day，当前值为 {day_rule}")
-    selected: list[pd.Timestamp] = []
-    seen_periods: set[tuple[int, int]] = set()
-    for timestamp in index:
-        key = _period_key(pd.Timestamp(timestamp), frequency)
-        if key in seen_periods:
-            continue
-        seen_periods.add(key)
-        selected.append(pd.Timestamp(timestamp))
-    return set(selected)
-
-
-def _build_equity_curve(history_rows: list[dict[str, object]]) -> pd.DataFrame:
-    frame = pd.DataFrame(history_rows)
-    if frame.empty:
+    _require_supported_day_rule(day_rule)
+    period_keys = _period_keys(pd.DatetimeIndex(index), frequency)
+    return np.flatnonzero(~pd.Index(period_keys).duplicated()).astype(np.int64)
+
+
+def _build_window_dca_schedules(
+    index: pd.DatetimeIndex,
+    window_bounds: list[tuple[int, int]],
+    frequency: str,
+    day_rule: str,
+) -> list[np.ndarray]:
+    """一次算出全样本的周期起点，再批量切给各个连续窗口。
+
+    `index` 已按时间升序，窗口内每个周期的第一个交易日要么是窗口首日，要么是
+    全样本里周期键发生变化的位置；全部窗口的切分边界用一次 `np.searchsorted`
+    得到，结果与逐窗口调用 `_build_dca_schedule` 一致。
+    """
+    _require_supported_day_rule(day_rule)
+    period_keys = _period_keys(pd.DatetimeIndex(index), frequency)
+    period_starts = np.flatnonzero(period_keys[1:] != period_keys[:-1]).astype(np.int64) + 1
+    bounds = np.asarray(window_bounds, dtype=np.int64).reshape(-1, 2)
+    lower = np.searchsorted(period_starts, bounds[:, 0], side="right")
+    upper = np.searchsorted(period_starts, bounds[:, 1], side="left")
+    return [
+        np.concatenate((np.array([start_index], dtype=np.int64), period_starts[low:high]))
+        if end_index > start_index
+        else np.empty(0, dtype=np.int64)
+        for (start_index, end_index), low, high in zip(bounds.tolist(), lower.tolist(), upper.tolist())
+    ]
+
+
+def _build_equity_curve(index: pd.DatetimeIndex, equity: np.ndarray) -> pd.DataFrame:
+    if len(equity) == 0:
         return pd.DataFrame()
-    frame["Date"] = pd.to_datetime(frame["Date"])
-    curve = frame.set_index("Date")[["Equity"]].copy()
+    curve = pd.DataFrame({"Equity": equity}, index=pd.DatetimeIndex(np.asarray(index, dtype="datetime64[ns]"), name="Date"))
     curve["PeakEquity"] = curve["Equity"].cummax()
     curve["DrawdownPct"] = np.where(curve["PeakEquity"] > 0, curve["Equity"] / curve["PeakEquity"] - 1, 0.0)
     return curve
@@ -137,148 +170,165 @@ def run_dca_backtest(
     params: dict[str, object],
     total_capital: float = TOTAL_CAPITAL,
     execution_config: ExecutionConfig | None = None,
+    record_details: bool = True,
 ) -> dict[str, object]:
-    """运行一次固定周期定投回测。"""
+    """运行一次固定周期定投回测。
+
+    `record_details=False` 供寻参扫描使用：汇总指标不变，但不生成逐日快照、
+    事件、交易和权益曲线表，最优参数再按完整明细重跑一次用于展示。
+    """
     if data.empty:
         raise ValueError("定投回测需要非空行情数据。")
     execution = execution_config or build_execution_config("research")
-    frame = data.copy()
-    if not isinstance(frame.index, pd.DatetimeIndex):
-        frame.index = pd.to_datetime(frame.index)
-    frame = frame.sort_index()
+    frame = _prepare_dca_frame(data)
 
     investment_amount = float(params["investment_amount"])
     frequency = str(params["frequency"])
     day_rule = str(params["day_rule"])
     dca_position_ratio = float(params.get("max_position_ratio", execution.max_position_ratio))
     max_position_ratio = min(max(dca_position_ratio, 0.0), max(execution.max_position_ratio, 0.0))
-    schedule_dates = _build_dca_schedule(frame.index, frequency=frequency, day_rule=day_rule)
-
-    cash = total_capital
-    position_units = 0
-    total_cost_basis = 0.0
-    transaction_cost_total = 0.0
-    slippage_cost_total = 0.0
-    invested_cash = 0.0
-    buy_count = 0
-    skip_count = 0
-    max_position_ratio_used = 0.0
-    peak_equity = total_capital
-    max_drawdown_pct = 0.0
-    event_rows: list[dict[str, object]] = []
-    trade_rows: list[dict[str, object]] = []
-    history_rows: list[dict[str, object]] = []
-
-    for timestamp, row in frame.iterrows():
-        current_date = pd.Timestamp(timestamp)
-        close_price = float(row["Close"])
-        market_value_before = position_units * close_price
-        position_budget_left = max(total_capital * max_position_ratio - market_value_before, 0.0)
-        available_budget = min(investment_amount, cash, position_budget_left)
-
-        if current_date in schedule_dates:
-            execution_price = _buy_execution_price(close_price, execution)
-            units = _affordable_units(available_budget, close_price, lot_size, execution)
-            if units > 0:
-                fee = _transaction_cost(execution_price, units, execution)
-                cash_required = units * execution_price + fee
-                cash -= cash_required
-                position_units += units
-                total_cost_basis += cash_required
-                invested_cash += cash_required
-                transaction_cost_total += fee
-                slippage_cost = units * max(execution_price - close_price, 0.0)
-                slippage_cost_total += slippage_cost
-                buy_count += 1
-                event_rows.append(
-                    {
-                        "Date": format_timestamp(current_date),
-                        "EventType": "dca_buy",
-                        "Level": 0,
-                        "Price": close_price,
-                        "ExecutionPrice": execution_price,
-                        "Units": units,
-                        "CashFlow": cash_required,
-                        "TransactionCost": fee,
-                        "SlippageCost": slippage_cost,
-                        "Note": f"{frequency} 定投买入",
-                    }
-                )
-                trade_rows.append(
-                    {
-                        "EntryTime": format_timestamp(current_date),
-                        "ExitTime": format_timestamp(current_date),
-                        "Duration": "0 days",
-                        "EntryPrice": execution_price,
-                        "ExitPrice": execution_price,
-                        # 平台详情用 Size 符号判断买卖方向，买入记录保持负数。
-                        "Size": -units,
-                        "PnL": 0.0,
-                        "ReturnPct": 0.0,
-                        "Tag": "dca_buy",
-                    }
-                )
-            else:
-                skip_count += 1
-                event_rows.append(
-                    {
-                        "Date": format_timestamp(current_date),
-                        "EventType": "dca_skip",
-                        "Level": 0,
-                        "Price": close_price,
-                        "ExecutionPrice": close_price,
-                        "Units": 0,
-                        "CashFlow": 0.0,
-                        "TransactionCost": 0.0,
-                        "SlippageCost": 0.0,
-                        "Note": "可用预算不足一手或已触及仓位上限，跳过本期定投",
-                    }
-                )
-
-        market_value = position_units * close_price
-        equity = cash + market_value
-        peak_equity = max(peak_equity, equity)
-        drawdown_pct = (equity / peak_equity - 1) * 100 if peak_equity else 0.0
-        max_drawdown_pct = min(max_drawdown_pct, drawdown_pct)
-        position_ratio = market_value / total_capital if total_capital else 0.0
-        max_position_ratio_used = max(max_position_ratio_used, position_ratio)
-        average_cost = total_cost_basis / position_units if position_units else 0.0
-        unrealized_pnl = position_units * close_price - total_cost_basis if position_units else 0.0
-        history_rows.append(
+    schedule_positions = _build_dca_schedule(frame.index, frequency=frequency, day_rule=day_rule)
+
+    # 定投只有触发日会改变现金和持仓：逐笔撮合交给编译后的数值内核，
+    # 其余交易日的账户状态和明细表都按列批量推导。
+    if lot_size <= 0:
+        raise ValueError(f"lot_size 必须大于 0，当前值为 {lot_size}")
+    close = np.ascontiguousarray(frame["Close"].to_numpy(dtype=np.float64))
+    bar_count = len(close)
+    event_count = len(schedule_positions)
+    event_units = np.empty(event_count, dtype=np.int64)
+    event_execution_price = np.empty(event_count, dtype=np.float64)
+    event_cash_required = np.empty(event_count, dtype=np.float64)
+    event_fee = np.empty(event_count, dtype=np.float64)
+    event_slippage = np.empty(event_count, dtype=np.float64)
+    simulate_dca(
+        close,
+        schedule_positions,
+        float(total_capital),
+        investment_amount,
+        max_position_ratio,
+        int(lot_size),
+        float(execution.slippage_bps),
+        float(execution.commission_bps),
+        event_units,
+        event_execution_price,
+        event_cash_required,
+        event_fee,
+        event_slippage,
+    )
+    bought = event_units > 0
+    buy_count = int(bought.sum())
+    skip_count = event_count - buy_count
+
+    cash_delta = np.zeros(bar_count, dtype=np.float64)
+    units_delta = np.zeros(bar_count, dtype=np.int64)
+    cost_delta = np.zeros(bar_count, dtype=np.float64)
+    fee_delta = np.zeros(bar_count, dtype=np.float64)
+    slippage_delta = np.zeros(bar_count, dtype=np.float64)
+    buy_positions = schedule_positions[bought]
+    cash_delta[buy_positions] = -event_cash_required[bought]
+    units_delta[buy_positions] = event_units[bought]
+    cost_delta[buy_positions] = event_cash_required[bought]
+    fee_delta[buy_positions] = event_fee[bought]
+    slippage_delta[buy_positions] = event_slippage[bought]
+
+    if record_details:
+        event_dates = format_timestamp_index(frame.index[schedule_positions])
+        event_close = close[schedule_positions]
+        events = pd.DataFrame(
             {
-                "Date": format_timestamp(current_date),
-                "Close": close_price,
-                "PositionUnits": position_units,
-                "OpenGridLevels": 1 if position_units > 0 else 0,
-                "GrossCost": total_cost_basis,
-                "RealizedGridProfit": 0.0,
-                "ClosedGridNetProfit": 0.0,
-                "UnrealizedPnl": unrealized_pnl,
-                "EffectiveCost": average_cost,
-                "CostReductionPct": 0.0,
-                "MarketValue": market_value,
-                "OpenGridMarketValue": market_value,
-                "PositionRatioPct": position_ratio * 100,
-                "MaxCapitalUsedPct": max_position_ratio_used * 100,
-                "TransactionCostCumulative": transaction_cost_total,
-                "SlippageCostCumulative": slippage_cost_total,
-                "MaxPositionRatioUsedPct": max_position_ratio_used * 100,
-                "Equity": equity,
+                "Date": event_dates,
+                "EventType": np.where(bought, "dca_buy", "dca_skip").astype(object),
+                "Level": np.zeros(event_count, dtype=np.int64),
+                "Price": event_close,
+                "ExecutionPrice": np.where(bought, event_execution_price, event_close),
+                "Units": event_units,
+                "CashFlow": event_cash_required,
+                "TransactionCost": event_fee,
+                "SlippageCost": event_slippage,
+                "Note": np.where(
+                    bought,
+                    f"{frequency} 定投买入",
+                    "可用预算不足一手或已触及仓位上限，跳过本期定投",
+                ).astype(object),
             }
         )
-
-    history = pd.DataFrame(history_rows)
-    events = pd.DataFrame(event_rows)
-    trades = pd.DataFrame(trade_rows)
-    equity_curve = _build_equity_curve(history_rows)
-    final_equity = float(history.iloc[-1]["Equity"]) if not history.empty else total_capital
+    else:
+        events = pd.DataFrame()
+    if record_details and buy_count:
+        buy_dates = event_dates[bought]
+        buy_prices = event_execution_price[bought]
+        trades = pd.DataFrame(
+            {
+                "EntryTime": buy_dates,
+                "ExitTime": buy_dates,
+                "Duration": "0 days",
+                "EntryPrice": buy_prices,
+                "ExitPrice": buy_prices,
+                # 平台详情用 Size 符号判断买卖方向，买入记录保持负数。
+                "Size": -event_units[bought],
+                "PnL": 0.0,
+                "ReturnPct": 0.0,
+                "Tag": "dca_buy",
+            }
+        )
+    else:
+        trades = pd.DataFrame()
+
+    # 累加顺序与逐日循环一致：现金从总资金起逐笔扣减，峰值权益从总资金起滚动取最大。
+    cash_path = np.cumsum(np.concatenate(([total_capital], cash_delta)))[1:]
+    units_path = np.cumsum(units_delta)
+    cost_path = np.cumsum(cost_delta)
+    fee_path = np.cumsum(fee_delta)
+    slippage_path = np.cumsum(slippage_delta)
+    market_value = units_path * close
+    equity = cash_path + market_value
+    peak_path = np.maximum.accumulate(np.concatenate(([total_capital], equity)))[1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdown_path = np.where(peak_path != 0, (equity / peak_path - 1) * 100, 0.0)
+        position_ratio = market_value / total_capital if total_capital else np.zeros(bar_count)
+        average_cost = np.where(units_path != 0, cost_path / units_path, 0.0)
+    max_drawdown_pct = min(0.0, float(drawdown_path.min()))
+    max_ratio_path = np.maximum.accumulate(np.maximum(position_ratio, 0.0))
+    max_position_ratio_used = float(max_ratio_path[-1])
+    unrealized_pnl = np.where(units_path != 0, units_path * close - cost_path, 0.0)
+    invested_cash = float(cost_path[-1])
+    transaction_cost_total = float(fee_path[-1])
+    slippage_cost_total = float(slippage_path[-1])
+
+    history = pd.DataFrame() if not record_details else pd.DataFrame(
+        {
+            "Date": format_timestamp_index(frame.index),
+            "Close": close,
+            "PositionUnits": units_path,
+            "OpenGridLevels": (units_path > 0).astype(np.int64),
+            "GrossCost": cost_path,
+            "RealizedGridProfit": 0.0,
+            "ClosedGridNetProfit": 0.0,
+            "UnrealizedPnl": unrealized_pnl,
+            "EffectiveCost": average_cost,
+            "CostReductionPct": 0.0,
+            "MarketValue": market_value,
+            "OpenGridMarketValue": market_value,
+            "PositionRatioPct": position_ratio * 100,
+            "MaxCapitalUsedPct": max_ratio_path * 100,
+            "TransactionCostCumulative": fee_path,
+            "SlippageCostCumulative": slippage_path,
+            "MaxPositionRatioUsedPct": max_ratio_path * 100,
+            "Equity": equity,
+        }
+    )
+    equity_curve = _build_equity_curve(frame.index, equity) if record_details else pd.DataFrame()
+    final_equity = float(equity[-1])
     return_pct = (final_equity / total_capital - 1) * 100 if total_capital else 0.0
     invested_ratio_pct = invested_cash / total_capital * 100 if total_capital else 0.0
     annual_factor = _annualization_factor(frame.index)
     annual_return_pct = ((final_equity / total_capital) ** (annual_factor / max(len(frame), 1)) - 1) * 100 if total_capital else 0.0
-    benchmark_metrics = _build_benchmark_metrics(frame, total_capital, lot_size, execution)
-    latest_snapshot = history.iloc[-1].to_dict() if not history.empty else {}
+    benchmark_metrics = _build_benchmark_metrics(float(close[0]), float(close[-1]), total_capital, lot_size, execution)
     score = _compute_score(return_pct, abs(max_drawdown_pct), invested_ratio_pct)
+    first_date = format_timestamp(frame.index[0])
+    peak_index = int(np.argmax(close))
+    first_buy_index = int(np.argmax(bought)) if buy_count else -1
 
     summary = {
         "Symbol": symbol,
@@ -287,14 +337,14 @@ def run_dca_backtest(
         "StrategyKind": "dca",
         "StrategyName": "定投",
         "SignalFamily": "dca",
-        "StartDate": format_timestamp(frame.index.min()),
-        "EndDate": format_timestamp(frame.index.max()),
-        "PeakDate": format_timestamp(frame["Close"].idxmax()),
-        "PeakPrice": float(frame["Close"].max()),
-        "EntryDate": str(trades.iloc[0]["EntryTime"]) if not trades.empty else format_timestamp(frame.index.min()),
-        "EntryPrice": float(trades.iloc[0]["EntryPrice"]) if not trades.empty else float(frame.iloc[0]["Close"]),
-        "AnchorDate": format_timestamp(frame.index.min()),
-        "AnchorPrice": float(frame.iloc[0]["Close"]),
+        "StartDate": first_date,
+        "EndDate": format_timestamp(frame.index[-1]),
+        "PeakDate": format_timestamp(frame.index[peak_index]),
+        "PeakPrice": float(close[peak_index]),
+        "EntryDate": format_timestamp(frame.index[schedule_positions[first_buy_index]]) if buy_count else first_date,
+        "EntryPrice": float(event_execution_price[first_buy_index]) if buy_count else float(close[0]),
+        "AnchorDate": first_date,
+        "AnchorPrice": float(close[0]),
         "LotSize": lot_size,
         "LotSizeSource": lot_size_source,
         "BaseUnits": 0,
@@ -307,19 +357,19 @@ def run_dca_backtest(
         "NetPnl": final_equity - total_capital,
         "AnnualReturnPct": annual_return_pct,
         "MaxDrawdownPct": abs(max_drawdown_pct),
-        "ClosedTrades": int(len(trades)),
+        "ClosedTrades": buy_count,
         "WinRatePct": 0.0,
         "FinalEquity": final_equity,
         "TotalCapital": total_capital,
-        "PositionUnits": int(latest_snapshot.get("PositionUnits", 0)),
-        "EffectiveCost": float(latest_snapshot.get("EffectiveCost", 0.0)),
+        "PositionUnits": int(units_path[-1]),
+        "EffectiveCost": float(average_cost[-1]),
         "CostReductionPct": 0.0,
         "RealizedGridProfit": 0.0,
         "ClosedGridNetProfit": 0.0,
         "ClosedGridReturnPct": 0.0,
-        "UnrealizedPnl": float(latest_snapshot.get("UnrealizedPnl", 0.0)),
-        "OpenGridMarketValue": float(latest_snapshot.get("OpenGridMarketValue", 0.0)),
-        "MaxCapitalUsedPct": float(latest_snapshot.get("MaxCapitalUsedPct", 0.0)),
+        "UnrealizedPnl": float(unrealized_pnl[-1]),
+        "OpenGridMarketValue": float(market_value[-1]),
+        "MaxCapitalUsedPct": max_position_ratio_used * 100,
         "GridCyclesCompleted": buy_count,
         "ExecutionProfile": execution.profile,
         "CommissionBps": execution.commission_bps,
@@ -353,7 +403,7 @@ def run_dca_backtest(
         "DcaSkipCount": skip_count,
         "DcaInvestedCash": invested_cash,
         "DcaInvestedRatioPct": invested_ratio_pct,
-        "DcaAverageCost": float(latest_snapshot.get("EffectiveCost", 0.0)),
+        "DcaAverageCost": float(average_cost[-1]),
         **benchmark_metrics,
         "GridVsCashIdle": final_equity - float(benchmark_metrics["CashIdleFinalEquity"]),
         "GridVsBuyHold": final_equity - float(benchmark_metrics["BuyHoldFinalEquity"]),
@@ -376,12 +426,12 @@ def _set_dca_optimization_context(context: dict[str, object] | None) -> None:
     _DCA_OPTIMIZATION_CONTEXT = context
 
 
-def _summarize_dca_walk_forward(walk_forward_runs: list[dict[str, object]]) -> dict[str, float | int]:
-    summaries = [run_result["summary"] for run_result in walk_forward_runs]
-    score_values = [float(summary["Score"]) for summary in summaries]
-    return_values = [float(summary["ReturnPct"]) for summary in summaries]
-    drawdown_values = [float(summary["MaxDrawdownPct"]) for summary in summaries]
-    window_count = len(summaries)
+def _summarize_dca_walk_forward(
+    score_values: list[float],
+    return_values: list[float],
+    drawdown_values: list[float],
+) -> dict[str, float | int]:
+    window_count = len(score_values)
     positive_window_ratio = sum(1 for value in return_values if value > 0) / window_count * 100 if window_count else 0.0
     score_mean = float(np.mean(score_values)) if score_values else 0.0
     score_min = float(np.min(score_values)) if score_values else 0.0
@@ -405,7 +455,7 @@ def _run_dca_candidate_task(params: dict[str, object]) -> dict[str, object]:
     context = _DCA_OPTIMIZATION_CONTEXT
     if context is None:
         raise RuntimeError("定投寻参上下文尚未初始化。")
-    run_result = run_dca_backtest(
+    return run_dca_backtest(
         data=context["data"],
         scenario_name=str(context["scenario_name"]),
         symbol=str(context["symbol"]),
@@ -414,22 +464,97 @@ def _run_dca_candidate_task(params: dict[str, object]) -> dict[str, object]:
         lot_size_source=str(context["lot_size_source"]),
         params=params,
         execution_config=context["execution"],
+        record_details=False,
     )
-    walk_forward_runs = [
-        run_dca_backtest(
-            data=window,
-            scenario_name=f"{context['scenario_name']}_wf_{index + 1}",
-            symbol=str(context["symbol"]),
-            market=str(context["market"]),
-            lot_size=int(context["lot_size"]),
-            lot_size_source=str(context["lot_size_source"]),
-            params=params,
-            execution_config=context["execution"],
+
+
+def _evaluate_dca_walk_forward(
+    data: pd.DataFrame,
+    candidate_params: list[dict[str, object]],
+    window_bounds: list[tuple[int, int]],
+    lot_size: int,
+    execution: ExecutionConfig,
+    jobs: int,
+    total_capital: float = TOTAL_CAPITAL,
+) -> list[dict[str, float | int]]:
+    """一次性并行回测全部（参数，窗口）组合，返回每组参数的稳健性摘要。
+
+    稳健性窗口只需要收益、回撤和投入比例，不必为每个窗口重建完整明细，
+    因此把全部组合摊平后交给 `prange` 内核，结果与逐窗口调用
+    `run_dca_backtest` 完全一致。
+    """
+    frame = _prepare_dca_frame(data)
+    close = np.ascontiguousarray(frame["Close"].to_numpy(dtype=np.float64))
+    schedule_chunks: list[np.ndarray] = []
+    schedule_slots: dict[tuple[str, str], list[tuple[int, int]]] = {}
+    schedule_offset = 0
+    pair_bounds: list[tuple[int, int, int, int]] = []
+    pair_investment_amount: list[float] = []
+    pair_max_position_ratio: list[float] = []
+    for params in candidate_params:
+        frequency = str(params["frequency"])
+        day_rule = str(params["day_rule"])
+        dca_position_ratio = float(params.get("max_position_ratio", execution.max_position_ratio))
+        max_position_ratio = min(max(dca_position_ratio, 0.0), max(execution.max_position_ratio, 0.0))
+        slot_key = (frequency, day_rule)
+        if slot_key not in schedule_slots:
+            slots: list[tuple[int, int]] = []
+            for positions in _build_window_dca_schedules(frame.index, window_bounds, frequency, day_rule):
+                schedule_chunks.append(positions)
+                slots.append((schedule_offset, schedule_offset + len(positions)))
+                schedule_offset += len(positions)
+            schedule_slots[slot_key] = slots
+        for (start_index, end_index), (slot_start, slot_end) in zip(window_bounds, schedule_slots[slot_key]):
+            pair_bounds.append((start_index, end_index, slot_start, slot_end))
+            pair_investment_amount.append(float(params["investment_amount"]))
+            pair_max_position_ratio.append(max_position_ratio)
+
+    schedule_positions = np.ascontiguousarray(np.concatenate(schedule_chunks), dtype=np.int64)
+    pair_table = np.array(pair_bounds, dtype=np.int64)
+    pair_count = len(pair_bounds)
+    final_equity = np.empty(pair_count, dtype=np.float64)
+    max_drawdown_pct = np.empty(pair_count, dtype=np.float64)
+    invested_cash = np.empty(pair_count, dtype=np.float64)
+    with parallel_threads(jobs):
+        sweep_dca_windows(
+            close,
+            schedule_positions,
+            np.ascontiguousarray(pair_table[:, 0]),
+            np.ascontiguousarray(pair_table[:, 1]),
+            np.ascontiguousarray(pair_table[:, 2]),
+            np.ascontiguousarray(pair_table[:, 3]),
+            np.array(pair_investment_amount, dtype=np.float64),
+            np.array(pair_max_position_ratio, dtype=np.float64),
+            float(total_capital),
+            int(lot_size),
+            float(execution.slippage_bps),
+            float(execution.commission_bps),
+            final_equity,
+            max_drawdown_pct,
+            invested_cash,
         )
-        for index, window in enumerate(context["walk_forward_windows"])
-    ]
-    run_result["summary"].update(_summarize_dca_walk_forward(walk_forward_runs))
-    return run_result
+
+    if total_capital:
+        return_pct = (final_equity / total_capital - 1) * 100
+        invested_ratio_pct = invested_cash / total_capital * 100
+    else:
+        return_pct = np.zeros(pair_count)
+        invested_ratio_pct = np.zeros(pair_count)
+    drawdown_pct = np.abs(max_drawdown_pct)
+    window_count = len(window_bounds)
+    summaries: list[dict[str, float | int]] = []
+    for candidate_index in range(len(candidate_params)):
+        pair_slice = slice(candidate_index * window_count, (candidate_index + 1) * window_count)
+        return_values = [float(value) for value in return_pct[pair_slice]]
+        drawdown_values = [float(value) for value in drawdown_pct[pair_slice]]
+        score_values = [
+            _compute_score(return_value, drawdown_value, float(ratio))
+            for return_value, drawdown_value, ratio in zip(
+                return_values, drawdown_values, invested_ratio_pct[pair_slice], strict=True
+            )
+        ]
+        summaries.append(_summarize_dca_walk_forward(score_values, return_values, drawdown_values))
+    return summaries
 
 
 def optimize_dca_parameters(
@@ -451,13 +576,15 @@ def optimize_dca_parameters(
     candidate_params = [dict(zip(keys, values)) for values in product(*(parameter_space[key] for key in keys))]
     if not candidate_params:
         raise ValueError("定投参数空间为空。")
+    # 全部候选共用同一份已排序行情，单次回测里不再重复复制和排序。
+    data = _prepare_dca_frame(data)
+    window_bounds = build_walk_forward_bounds(
+        data,
+        window_count=wf_window_count,
+        min_window_size=wf_min_window_size,
+    )
     context = {
         "data": data,
-        "walk_forward_windows": build_walk_forward_windows(
-            data,
-            window_count=wf_window_count,
-            min_window_size=wf_min_window_size,
-        ),
         "scenario_name": scenario_name,
         "symbol": symbol,
         "market": market,
@@ -481,9 +608,19 @@ def optimize_dca_parameters(
             initargs=(context,),
         ) as executor:
             candidate_runs = list(executor.map(_run_dca_candidate_task, candidate_params))
+    walk_forward_summaries = _evaluate_dca_walk_forward(
+        data,
+        candidate_params,
+        window_bounds,
+        lot_size=lot_size,
+        execution=execution,
+        jobs=effective_jobs,
+    )
+    for run_result, walk_forward_summary in zip(candidate_runs, walk_forward_summaries, strict=True):
+        run_result["summary"].update(walk_forward_summary)
 
     rows = [run_result["summary"] for run_result in candidate_runs]
-    run_records = {
+    candidate_records = {
         json.dumps(
             {
                 "investment_amount": row["investment_amount"],
@@ -493,8 +630,8 @@ def optimize_dca_parameters(
             },
             ensure_ascii=False,
             sort_keys=True,
-        ): run_result
-        for row, run_result in zip(rows, candidate_runs, strict=True)
+        ): candidate_index
+        for candidate_index, row in enumerate(rows)
     }
     results = pd.DataFrame(rows).sort_values(
         ["RobustScore", "WalkForwardScoreMin", "WalkForwardPositiveWindowRatio", "Score", "ReturnPct"],
@@ -513,7 +650,19 @@ def optimize_dca_parameters(
         ensure_ascii=False,
         sort_keys=True,
     )
-    best_run = run_records.get(best_key)
-    if best_run is None:
+    best_index = candidate_records.get(best_key)
+    if best_index is None:
         raise ValueError("无法回取最优定投参数对应的回测结果。")
+    # 扫描阶段只保留汇总，最优参数按完整明细重跑一次，供报告和平台展示。
+    best_run = run_dca_backtest(
+        data=data,
+        scenario_name=scenario_name,
+        symbol=symbol,
+        market=market,
+        lot_size=lot_size,
+        lot_size_source=lot_size_source,
+        params=candidate_params[best_index],
+        execution_config=execution,
+    )
+    best_run["summary"].update(walk_forward_summaries[best_index])
     return results, best_run
@@ -18,12 +18,13 @@ import pandas as pd
 
 from strategy_studio.settings import ExecutionConfig, build_execution_config
 from strategy_studio.strategy.metrics import compute_score
-from strategy_studio.strategy.sampling import format_timestamp
+from strategy_studio.strategy.sampling import format_timestamp, format_timestamp_index
 
 
 TOTAL_CAPITAL = 10000.0
 BASE_POSITION_RATIO = 0.5
 GRID_TRADE_RATIO = 0.2
+_TRIGGER_SCAN_BLOCK = 64
 
 
 @dataclass(frozen=True)
@@ -178,12 +179,81 @@ def _grid_cost_basis(grid_lots: list[dict[str, float | int]]) -> float:
     return sum(int(lot["units"]) * float(lot["entry_price"]) + float(lot["entry_cost"]) for lot in grid_lots)
 
 
-def _build_equity_curve(history_rows: list[dict[str, object]]) -> pd.DataFrame:
-    frame = pd.DataFrame(history_rows)
-    if frame.empty:
+def _capture_segment_state(
+    cash: float,
+    reference_price: float,
+    realized_grid_profit: float,
+    transaction_cost_total: float,
+    slippage_cost_total: float,
+    grid_lots: list[dict[str, float | int]],
+) -> dict[str, object]:
+    """记录一次成交后的账户状态；网格仓按值拷贝，避免后续 FIFO 结转改写历史段。"""
+    return {
+        "cash": cash,
+        "reference_price": reference_price,
+        "realized_grid_profit": realized_grid_profit,
+        "transaction_cost_total": transaction_cost_total,
+        "slippage_cost_total": slippage_cost_total,
+        "grid_cost_basis": _grid_cost_basis(grid_lots),
+        "lots": [(int(lot["units"]), float(lot["entry_price"]), float(lot["entry_cost"])) for lot in grid_lots],
+    }
+
+
+def _find_arm_position(close: np.ndarray, cursor: int, buy_threshold: float, sell_threshold: float) -> int:
+    """返回从 `cursor` 起首根触及涨跌阈值的位置；直到样本结束都未触及时返回 -1。
+
+    按翻倍块长扫描，触发发生得早时不必每次都比较剩余全部样本。
+    """
+    block_start = cursor
+    block_size = _TRIGGER_SCAN_BLOCK
+    while block_start < len(close):
+        block_end = min(block_start + block_size, len(close))
+        window = close[block_start:block_end]
+        hits = (window <= buy_threshold) | (window >= sell_threshold)
+        offset = int(np.argmax(hits))
+        if hits[offset]:
+            return block_start + offset
+        block_start = block_end
+        block_size *= 2
+    return -1
+
+
+def _find_retrace_trigger(
+    close: np.ndarray,
+    arm_position: int,
+    armed_side: str,
+    retrace_pct: float,
+) -> int:
+    """返回触发位之后首个回落/反弹确认位置；直到样本结束都未确认时返回 -1。
+
+    局部高低点就是从触发位开始的累计极值，按块算出后用 argmax 找首个确认点，
+    块间带上前一块的极值。
+    """
+    extreme_price = close[arm_position]
+    block_start = arm_position + 1
+    block_size = _TRIGGER_SCAN_BLOCK
+    while block_start < len(close):
+        block_end = min(block_start + block_size, len(close))
+        window = close[block_start:block_end]
+        if armed_side == "buy":
+            extreme = np.minimum(np.minimum.accumulate(window), extreme_price)
+            confirmed = window >= extreme * (1 + retrace_pct)
+        else:
+            extreme = np.maximum(np.maximum.accumulate(window), extreme_price)
+            confirmed = window <= extreme * (1 - retrace_pct)
+        offset = int(np.argmax(confirmed))
+        if confirmed[offset]:
+            return block_start + offset
+        extreme_price = extreme[-1]
+        block_start = block_end
+        block_size *= 2
+    return -1
+
+
+def _build_equity_curve(history: pd.DataFrame) -> pd.DataFrame:
+    if history.empty:
         return pd.DataFrame()
-    frame["Date"] = pd.to_datetime(frame["Date"])
-    curve = frame.set_index("Date")[["Equity"]].copy()
+    curve = history[["Equity"]].set_axis(pd.DatetimeIndex(pd.to_datetime(history["Date"]), name="Date"))
     curve["PeakEquity"] = curve["Equity"].cummax()
     curve["DrawdownPct"] = np.where(curve["PeakEquity"] > 0, curve["Equity"] / curve["PeakEquity"] - 1, 0.0)
     return curve
@@ -228,8 +298,6 @@ def run_index_grid_backtest(
 
     base_market_value = base_units * first_close
     reference_price = base_execution_price
-    armed_side = ""
-    extreme_price = reference_price
     peak_equity = cash + base_market_value
     max_drawdown_pct = 0.0
     max_position_ratio_used = base_market_value / total_capital if total_capital else 0.0
@@ -258,171 +326,229 @@ def run_index_grid_backtest(
             "Note": "首根 K 线建立长期底仓",
         }
     ]
-    history_rows: list[dict[str, object]] = []
 
-    for index, (timestamp, row) in enumerate(data.iterrows()):
-        close_price = float(row["Close"])
-        if index == 0:
-            pass
+    close = data["Close"].to_numpy(dtype=np.float64)
+    close_values = close.tolist()
+    bar_count = len(close)
+    # 账户状态只在成交时变化：按成交位置切段记录，逐 K 线快照最后按段展开。
+    segment_starts = [0]
+    segment_states = [
+        _capture_segment_state(
+            cash, reference_price, realized_grid_profit, transaction_cost_total, slippage_cost_total, grid_lots
+        )
+    ]
+    armed_spans: list[tuple[str, int, int]] = []
+
+    cursor = 1
+    while cursor < bar_count:
+        # 参考价只在成交后变化，涨跌阈值按段计算一次，再用向量扫描找下一次触发。
+        buy_threshold = reference_price * (1 - spec.decline_trigger_pct)
+        sell_threshold = reference_price * (1 + spec.rise_trigger_pct)
+        arm_position = _find_arm_position(close, cursor, buy_threshold, sell_threshold)
+        if arm_position < 0:
+            break
+        armed_side = "buy" if close_values[arm_position] <= buy_threshold else "sell"
+        retrace_pct = spec.buy_rebound_pct if armed_side == "buy" else spec.sell_pullback_pct
+        trigger_position = _find_retrace_trigger(close, arm_position, armed_side, retrace_pct)
+        if trigger_position < 0:
+            armed_spans.append((armed_side, arm_position, bar_count))
+            break
+        armed_spans.append((armed_side, arm_position, trigger_position))
+
+        close_price = close_values[trigger_position]
+        traded = False
+        if armed_side == "buy":
+            execution_price = _buy_execution_price(close_price, execution)
+            units = _affordable_units(min(grid_cash_budget, cash), close_price, lot_size, execution)
+            if units > 0:
+                entry_cost = _transaction_cost(execution_price, units, execution)
+                cash_required = units * execution_price + entry_cost
+                if cash_required <= cash:
+                    timestamp = data.index[trigger_position]
+                    cash -= cash_required
+                    grid_lots.append(
+                        {
+                            "units": units,
+                            "entry_price": execution_price,
+                            "entry_cost": entry_cost,
+                            "entry_time": timestamp,
+                        }
+                    )
+                    transaction_cost_total += entry_cost
+                    slippage_cost_total += units * max(execution_price - close_price, 0.0)
+                    grid_trade_count += 1
+                    grid_buy_count += 1
+                    event_rows.append(
+                        {
+                            "Date": format_timestamp(timestamp),
+                            "EventType": "retrace_buy",
+                            "Level": 1,
+                            "Price": close_price,
+                            "ExecutionPrice": execution_price,
+                            "Units": units,
+                            "CashFlow": cash_required,
+                            "TransactionCost": entry_cost,
+                            "SlippageCost": units * max(execution_price - close_price, 0.0),
+                            "Note": "下跌触发后从局部低点反弹，执行一笔网格买入",
+                        }
+                    )
+                    reference_price = execution_price
+                    traded = True
+                else:
+                    risk_skip_events += 1
+            else:
+                risk_skip_events += 1
         else:
-            if armed_side == "":
-                if close_price <= reference_price * (1 - spec.decline_trigger_pct):
-                    armed_side = "buy"
-                    extreme_price = close_price
-                elif close_price >= reference_price * (1 + spec.rise_trigger_pct):
-                    armed_side = "sell"
-                    extreme_price = close_price
-            elif armed_side == "buy":
-                extreme_price = min(extreme_price, close_price)
-                if close_price >= extreme_price * (1 + spec.buy_rebound_pct):
-                    execution_price = _buy_execution_price(close_price, execution)
-                    units = _affordable_units(min(grid_cash_budget, cash), close_price, lot_size, execution)
-                    if units > 0:
-                        entry_cost = _transaction_cost(execution_price, units, execution)
-                        cash_required = units * execution_price + entry_cost
-                        if cash_required <= cash:
-                            cash -= cash_required
-                            grid_lots.append(
-                                {
-                                    "units": units,
-                                    "entry_price": execution_price,
-                                    "entry_cost": entry_cost,
-                                    "entry_time": timestamp,
-                                }
-                            )
-                            transaction_cost_total += entry_cost
-                            slippage_cost_total += units * max(execution_price - close_price, 0.0)
-                            grid_trade_count += 1
-                            grid_buy_count += 1
-                            event_rows.append(
-                                {
-                                    "Date": format_timestamp(timestamp),
-                                    "EventType": "retrace_buy",
-                                    "Level": 1,
-                                    "Price": close_price,
-                                    "ExecutionPrice": execution_price,
-                                    "Units": units,
-                                    "CashFlow": cash_required,
-                                    "TransactionCost": entry_cost,
-                                    "SlippageCost": units * max(execution_price - close_price, 0.0),
-                                    "Note": "下跌触发后从局部低点反弹，执行一笔网格买入",
-                                }
-                            )
-                            reference_price = execution_price
-                        else:
-                            risk_skip_events += 1
-                    else:
-                        risk_skip_events += 1
-                    armed_side = ""
-                    extreme_price = reference_price
-            elif armed_side == "sell":
-                extreme_price = max(extreme_price, close_price)
-                if close_price <= extreme_price * (1 - spec.sell_pullback_pct):
-                    open_grid_units = sum(int(lot["units"]) for lot in grid_lots)
-                    units = min(grid_units_per_trade, open_grid_units)
-                    if units > 0:
-                        execution_price = _sell_execution_price(close_price, execution)
-                        exit_cost = _transaction_cost(execution_price, units, execution)
-                        realized_profit, realized_cost_basis = _fifo_close_grid_lots(
-                            grid_lots=grid_lots,
-                            sell_units=units,
-                            execution_price=execution_price,
-                            exit_cost=exit_cost,
-                        )
-                        cash += units * execution_price - exit_cost
-                        realized_grid_profit += realized_profit
-                        transaction_cost_total += exit_cost
-                        slippage_cost_total += units * max(close_price - execution_price, 0.0)
-                        grid_trade_count += 1
-                        grid_sell_count += 1
-                        trade_rows.append(
-                            {
-                                "EntryTime": "",
-                                "ExitTime": format_timestamp(timestamp),
-                                "Duration": "",
-                                "EntryPrice": realized_cost_basis / units if units > 0 else 0.0,
-                                "ExitPrice": execution_price,
-                                "Size": units,
-                                "PnL": realized_profit,
-                                "ReturnPct": (execution_price / (realized_cost_basis / units) - 1) if realized_cost_basis > 0 else 0.0,
-                                "Tag": "retrace_grid",
-                            }
-                        )
-                        event_rows.append(
-                            {
-                                "Date": format_timestamp(timestamp),
-                                "EventType": "retrace_sell",
-                                "Level": 1,
-                                "Price": close_price,
-                                "ExecutionPrice": execution_price,
-                                "Units": units,
-                                "CashFlow": units * execution_price - exit_cost,
-                                "TransactionCost": exit_cost,
-                                "SlippageCost": units * max(close_price - execution_price, 0.0),
-                                "Note": "上涨触发后从局部高点回落，卖出一笔网格仓",
-                            }
-                        )
-                        reference_price = execution_price
-                    else:
-                        risk_skip_events += 1
-                    armed_side = ""
-                    extreme_price = reference_price
-
-        grid_units = sum(int(lot["units"]) for lot in grid_lots)
+            open_grid_units = sum(int(lot["units"]) for lot in grid_lots)
+            units = min(grid_units_per_trade, open_grid_units)
+            if units > 0:
+                timestamp = data.index[trigger_position]
+                execution_price = _sell_execution_price(close_price, execution)
+                exit_cost = _transaction_cost(execution_price, units, execution)
+                realized_profit, realized_cost_basis = _fifo_close_grid_lots(
+                    grid_lots=grid_lots,
+                    sell_units=units,
+                    execution_price=execution_price,
+                    exit_cost=exit_cost,
+                )
+                cash += units * execution_price - exit_cost
+                realized_grid_profit += realized_profit
+                transaction_cost_total += exit_cost
+                slippage_cost_total += units * max(close_price - execution_price, 0.0)
+                grid_trade_count += 1
+                grid_sell_count += 1
+                trade_rows.append(
+                    {
+                        "EntryTime": "",
+                        "ExitTime": format_timestamp(timestamp),
+                        "Duration": "",
+                        "EntryPrice": realized_cost_basis / units if units > 0 else 0.0,
+                        "ExitPrice": execution_price,
+                        "Size": units,
+                        "PnL": realized_profit,
+                        "ReturnPct": (execution_price / (realized_cost_basis / units) - 1) if realized_cost_basis > 0 else 0.0,
+                        "Tag": "retrace_grid",
+                    }
+                )
+                event_rows.append(
+                    {
+                        "Date": format_timestamp(timestamp),
+                        "EventType": "retrace_sell",
+                        "Level": 1,
+                        "Price": close_price,
+                        "ExecutionPrice": execution_price,
+                        "Units": units,
+                        "CashFlow": units * execution_price - exit_cost,
+                        "TransactionCost": exit_cost,
+                        "SlippageCost": units * max(close_price - execution_price, 0.0),
+                        "Note": "上涨触发后从局部高点回落，卖出一笔网格仓",
+                    }
+                )
+                reference_price = execution_price
+                traded = True
+            else:
+                risk_skip_events += 1
+
+        if traded:
+            segment_starts.append(trigger_position)
+            segment_states.append(
+                _capture_segment_state(
+                    cash, reference_price, realized_grid_profit, transaction_cost_total, slippage_cost_total, grid_lots
+                )
+            )
+        cursor = trigger_position + 1
+
+    base_cost_basis = base_units * base_execution_price + base_entry_cost
+    position_units = np.empty(bar_count, dtype=np.int64)
+    grid_position_units = np.empty(bar_count, dtype=np.int64)
+    open_grid_levels = np.empty(bar_count, dtype=np.int64)
+    cash_path = np.empty(bar_count)
+    reference_path = np.empty(bar_count)
+    grid_cost_path = np.empty(bar_count)
+    realized_path = np.empty(bar_count)
+    transaction_cost_path = np.empty(bar_count)
+    slippage_cost_path = np.empty(bar_count)
+    effective_cost_path = np.empty(bar_count)
+    grid_unrealized_pnl = np.empty(bar_count)
+    for start, end, state in zip(segment_starts, segment_starts[1:] + [bar_count], segment_states):
+        lots = state["lots"]
+        grid_units = sum(units for units, _, _ in lots)
         total_units = base_units + grid_units
-        base_cost_basis = base_units * base_execution_price + base_entry_cost
-        grid_cost_basis = _grid_cost_basis(grid_lots)
-        base_unrealized_pnl = base_units * (close_price - base_execution_price)
-        grid_unrealized_pnl = sum(
-            int(lot["units"]) * (close_price - float(lot["entry_price"])) - float(lot["entry_cost"])
-            for lot in grid_lots
+        grid_cost_basis = state["grid_cost_basis"]
+        position_units[start:end] = total_units
+        grid_position_units[start:end] = grid_units
+        open_grid_levels[start:end] = len(lots)
+        cash_path[start:end] = state["cash"]
+        reference_path[start:end] = state["reference_price"]
+        grid_cost_path[start:end] = grid_cost_basis
+        realized_path[start:end] = state["realized_grid_profit"]
+        transaction_cost_path[start:end] = state["transaction_cost_total"]
+        slippage_cost_path[start:end] = state["slippage_cost_total"]
+        effective_cost_path[start:end] = (
+            (base_cost_basis + grid_cost_basis - state["realized_grid_profit"]) / total_units if total_units else 0.0
         )
-        market_value = total_units * close_price
-        equity = cash + market_value
-        peak_equity = max(peak_equity, equity)
-        drawdown_pct = (equity / peak_equity - 1) * 100 if peak_equity else 0.0
-        max_drawdown_pct = min(max_drawdown_pct, drawdown_pct)
-        position_ratio = market_value / total_capital if total_capital else 0.0
-        max_position_ratio_used = max(max_position_ratio_used, position_ratio)
-        effective_cost = (base_cost_basis + grid_cost_basis - realized_grid_profit) / total_units if total_units else 0.0
-
-        history_rows.append(
-            {
-                "Date": format_timestamp(timestamp),
-                "Close": close_price,
-                "PeakClose": max(reference_price, close_price),
-                "PositionUnits": total_units,
-                "BasePositionUnits": base_units,
-                "GridPositionUnits": grid_units,
-                "OpenGridLevels": len(grid_lots),
-                "GrossCost": base_cost_basis + grid_cost_basis,
-                "BaseCost": base_cost_basis,
-                "GridCost": grid_cost_basis,
-                "RealizedGridProfit": realized_grid_profit,
-                "ClosedGridNetProfit": realized_grid_profit,
-                "UnrealizedPnl": base_unrealized_pnl + grid_unrealized_pnl,
-                "BaseUnrealizedPnl": base_unrealized_pnl,
-                "GridUnrealizedPnl": grid_unrealized_pnl,
-                "EffectiveCost": effective_cost,
-                "CostReductionPct": 0.0,
-                "MarketValue": market_value,
-                "OpenGridMarketValue": grid_units * close_price,
-                "PositionRatioPct": position_ratio * 100,
-                "MaxCapitalUsedPct": max_position_ratio_used * 100,
-                "TransactionCostCumulative": transaction_cost_total,
-                "SlippageCostCumulative": slippage_cost_total,
-                "MaxPositionRatioUsedPct": max_position_ratio_used * 100,
-                "Equity": equity,
-                "ReferencePrice": reference_price,
-                "ArmedSide": armed_side,
-                "ExtremePrice": extreme_price,
-            }
-        )
-
-    history = pd.DataFrame(history_rows)
+        # 逐笔累加与原先按网格仓求和的顺序一致，保证浮点结果不变。
+        segment_close = close[start:end]
+        segment_unrealized = np.zeros(end - start)
+        for units, entry_price, entry_cost in lots:
+            segment_unrealized = segment_unrealized + (units * (segment_close - entry_price) - entry_cost)
+        grid_unrealized_pnl[start:end] = segment_unrealized
+
+    # 未触发和已确认成交的 K 线沿用参考价作为极值，触发后到确认前逐根推进局部高低点。
+    armed_side_path = np.full(bar_count, "", dtype=object)
+    extreme_path = reference_path.copy()
+    for armed_side, arm_position, span_end in armed_spans:
+        armed_side_path[arm_position:span_end] = armed_side
+        if armed_side == "buy":
+            extreme_path[arm_position:span_end] = np.minimum.accumulate(close[arm_position:span_end])
+        else:
+            extreme_path[arm_position:span_end] = np.maximum.accumulate(close[arm_position:span_end])
+
+    market_value = position_units * close
+    equity = cash_path + market_value
+    base_unrealized_pnl = base_units * (close - base_execution_price)
+    position_ratio = market_value / total_capital if total_capital else np.zeros(bar_count)
+    max_position_ratio_path = np.maximum(np.maximum.accumulate(position_ratio), max_position_ratio_used)
+    max_position_ratio_used = float(max_position_ratio_path[-1])
+    peak_equity_path = np.maximum(np.maximum.accumulate(equity), peak_equity)
+    equity_ratio = np.divide(equity, peak_equity_path, out=np.ones(bar_count), where=peak_equity_path != 0)
+    max_drawdown_pct = min(max_drawdown_pct, float(((equity_ratio - 1) * 100).min()))
+
+    history = pd.DataFrame(
+        {
+            "Date": format_timestamp_index(data.index),
+            "Close": close,
+            "PeakClose": np.maximum(reference_path, close),
+            "PositionUnits": position_units,
+            "BasePositionUnits": np.full(bar_count, base_units, dtype=np.int64),
+            "GridPositionUnits": grid_position_units,
+            "OpenGridLevels": open_grid_levels,
+            "GrossCost": base_cost_basis + grid_cost_path,
+            "BaseCost": np.full(bar_count, base_cost_basis),
+            "GridCost": grid_cost_path,
+            "RealizedGridProfit": realized_path,
+            "ClosedGridNetProfit": realized_path,
+            "UnrealizedPnl": base_unrealized_pnl + grid_unrealized_pnl,
+            "BaseUnrealizedPnl": base_unrealized_pnl,
+            "GridUnrealizedPnl": grid_unrealized_pnl,
+            "EffectiveCost": effective_cost_path,
+            "CostReductionPct": np.zeros(bar_count),
+            "MarketValue": market_value,
+            "OpenGridMarketValue": grid_position_units * close,
+            "PositionRatioPct": position_ratio * 100,
+            "MaxCapitalUsedPct": max_position_ratio_path * 100,
+            "TransactionCostCumulative": transaction_cost_path,
+            "SlippageCostCumulative": slippage_cost_path,
+            "MaxPositionRatioUsedPct": max_position_ratio_path * 100,
+            "Equity": equity,
+            "ReferencePrice": reference_path,
+            "ArmedSide": armed_side_path,
+            "ExtremePrice": extreme_path,
+        }
+    )
     events = pd.DataFrame(event_rows)
     trades = pd.DataFrame(trade_rows)
-    equity_curve = _build_equity_curve(history_rows)
+    equity_curve = _build_equity_curve(history)
     final_equity = float(history.iloc[-1]["Equity"]) if not history.empty else total_capital
     return_pct = (final_equity / total_capital - 1) * 100 if total_capital else 0.0
     annual_factor = _annualization_factor(data.index)
@@ -0,0 +1,363 @@
+from __future__ import annotations
+"""回测纯数值内核。
+
+这里只放不依赖 pandas、日志和配置对象的逐笔循环，统一用 Numba 按固定签名
+编译，并把编译结果落盘缓存，避免每次进程启动都重新 JIT。
+每个内核按收盘价 dtype 在首次调用时特化一次并记在进程内字典里：只导入策略
+注册表、从不跑定投的进程（API、Worker）不必在导入时加载编译结果。
+签名里的数组一律声明为 C 连续布局（`[::1]`），编译器可以按单位步长生成循环、
+省掉步长换算；调用方负责传入连续数组（通常一次 `np.ascontiguousarray`），
+并在 Python 侧重建明细表。
+"""
+
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import numba
+import numpy as np
+from numba import config, float32, float64, int64, njit, prange, void
+
+
+@njit(cache=True)
+def _dca_order(
+    close_price,
+    cash,
+    position_units,
+    total_capital,
+    investment_amount,
+    max_position_ratio,
+    lot_size,
+    slippage,
+    commission,
+):
+    """计算单个触发日的定投成交：返回股数、成交价、现金流和手续费。"""
+    market_value_before = position_units * close_price
+    position_budget_left = max(total_capital * max_position_ratio - market_value_before, 0.0)
+    available_budget = min(investment_amount, cash, position_budget_left)
+    execution_price = close_price * (1 + slippage / 10000)
+    unit_cash = execution_price * (1 + commission / 10000)
+    raw_units = int64(available_budget / unit_cash) if unit_cash > 0 else int64(0)
+    units = raw_units // lot_size * lot_size
+    if units <= 0:
+        return int64(0), execution_price, 0.0, 0.0
+    fee = execution_price * units * commission / 10000
+    return units, execution_price, units * execution_price + fee, fee
+
+
+_PRICE_TYPES = {
+    np.dtype(np.float64): float64,
+    np.dtype(np.float32): float32,
+}
+_KERNEL_CACHE: dict[tuple[str, np.dtype], object] = {}
+
+
+def _simulate_dca_signature(price_type):
+    return float64(
+        price_type[::1],
+        int64[::1],
+        float64,
+        float64,
+        float64,
+        int64,
+        float64,
+        float64,
+        int64[::1],
+        float64[::1],
+        float64[::1],
+        float64[::1],
+        float64[::1],
+    )
+
+
+def _sweep_dca_windows_signature(price_type):
+    return void(
+        price_type[::1],
+        int64[::1],
+        int64[::1],
+        int64[::1],
+        int64[::1],
+        int64[::1],
+        float64[::1],
+        float64[::1],
+        float64,
+        int64,
+        float64,
+        float64,
+        float64[::1],
+        float64[::1],
+        float64[::1],
+    )
+
+
+def _require_contiguous(**arrays: np.ndarray) -> None:
+    """内核签名只接受 C 连续数组，这里提前报出具体参数名，避免 Numba 只给出签名不匹配。"""
+    for name, array in arrays.items():
+        if not array.flags.c_contiguous:
+            raise ValueError(f"数值内核要求 {name} 为 C 连续数组，请先调用 np.ascontiguousarray。")
+
+
+def _prefer_openmp_threading_layer() -> None:
+    """在首次编译并行内核前把线程层改为优先 OpenMP；显式配置了环境变量时尊重用户选择。
+
+    Numba 默认顺序是 tbb → omp → workqueue。文档里 tbb 是 fork 安全的线程层，但随系统
+    libtbb 加载时，主进程跑过并行内核、又 fork 过寻参进程池后，解释器退出会卡死。
+    GNU OpenMP 不是 fork 安全的：fork 出的子进程不能再进入并行区。这里的 `prange` 内核
+    只在主进程调用，子进程只跑串行内核，所以选 OpenMP；workqueue 不支持多线程并发调用，
+    Worker 的线程池会同时跑多个回测，只作为没有 OpenMP 时的后备。
+
+    只在真正需要并行内核的进程里设置，只导入策略模块的进程不受影响。线程池在首次并行
+    调用或首次读写线程数时按该顺序启动，之后再改不再生效，所以 `parallel_threads`
+    和并行内核编译前都要先走这里。
+    """
+    if "NUMBA_THREADING_LAYER" in os.environ or "NUMBA_THREADING_LAYER_PRIORITY" in os.environ:
+        return
+    config.THREADING_LAYER_PRIORITY = ["omp", "workqueue", "tbb"]
+
+
+@contextmanager
+def parallel_threads(jobs: int) -> Iterator[None]:
+    """在上下文内把并行内核线程数限制为 `jobs`（不超过 Numba 上限），退出时恢复原值。"""
+    _prefer_openmp_threading_layer()
+    previous_threads = numba.get_num_threads()
+    numba.set_num_threads(max(1, min(int(jobs), config.NUMBA_NUM_THREADS)))
+    try:
+        yield
+    finally:
+        numba.set_num_threads(previous_threads)
+
+
+def _resolve_kernel(name: str, close_dtype: np.dtype):
+    """按（内核名，收盘价 dtype）取编译好的特化版本，首次调用时编译或从磁盘缓存加载。"""
+    key = (name, np.dtype(close_dtype))
+    kernel = _KERNEL_CACHE.get(key)
+    if kernel is None:
+        price_type = _PRICE_TYPES.get(key[1])
+        if price_type is None:
+            supported = ", ".join(str(dtype) for dtype in _PRICE_TYPES)
+            raise ValueError(f"数值内核仅支持以下收盘价 dtype: {supported}；当前为 {key[1]}")
+        implementation, build_signature, options = _KERNEL_SPECS[name]
+        if options.get("parallel"):
+            _prefer_openmp_threading_layer()
+        kernel = njit(build_signature(price_type), cache=True, **options)(implementation)
+        _KERNEL_CACHE[key] = kernel
+    return kernel
+
+
+def simulate_dca(
+    close,
+    schedule_positions,
+    total_capital,
+    investment_amount,
+    max_position_ratio,
+    lot_size,
+    slippage_bps,
+    commission_bps,
+    units_out,
+    execution_price_out,
+    cash_required_out,
+    fee_out,
+    slippage_out,
+):
+    """按触发日逐笔推进定投账户，返回期末现金。
+
+    每个触发日的成交结果写入 `*_out` 数组，下标与 `schedule_positions` 对齐；
+    `units_out` 为 0 表示本期因预算不足一手或触及仓位上限而跳过。
+    """
+    _require_contiguous(
+        close=close,
+        schedule_positions=schedule_positions,
+        units_out=units_out,
+        execution_price_out=execution_price_out,
+        cash_required_out=cash_required_out,
+        fee_out=fee_out,
+        slippage_out=slippage_out,
+    )
+    kernel = _resolve_kernel("simulate_dca", close.dtype)
+    return kernel(
+        close,
+        schedule_positions,
+        total_capital,
+        investment_amount,
+        max_position_ratio,
+        lot_size,
+        slippage_bps,
+        commission_bps,
+        units_out,
+        execution_price_out,
+        cash_required_out,
+        fee_out,
+        slippage_out,
+    )
+
+
+def sweep_dca_windows(
+    close,
+    schedule_positions,
+    pair_window_start,
+    pair_window_end,
+    pair_schedule_start,
+    pair_schedule_end,
+    pair_investment_amount,
+    pair_max_position_ratio,
+    total_capital,
+    lot_size,
+    slippage_bps,
+    commission_bps,
+    final_equity_out,
+    max_drawdown_pct_out,
+    invested_cash_out,
+):
+    """并行回测多组（参数，窗口）组合，只输出稳健性评分需要的三个指标。
+
+    每个组合对应 `close[pair_window_start:pair_window_end]` 上的一次独立定投，
+    触发日取 `schedule_positions[pair_schedule_start:pair_schedule_end]`。
+    """
+    _require_contiguous(
+        close=close,
+        schedule_positions=schedule_positions,
+        pair_window_start=pair_window_start,
+        pair_window_end=pair_window_end,
+        pair_schedule_start=pair_schedule_start,
+        pair_schedule_end=pair_schedule_end,
+        pair_investment_amount=pair_investment_amount,
+        pair_max_position_ratio=pair_max_position_ratio,
+        final_equity_out=final_equity_out,
+        max_drawdown_pct_out=max_drawdown_pct_out,
+        invested_cash_out=invested_cash_out,
+    )
+    kernel = _resolve_kernel("sweep_dca_windows", close.dtype)
+    kernel(
+        close,
+        schedule_positions,
+        pair_window_start,
+        pair_window_end,
+        pair_schedule_start,
+        pair_schedule_end,
+        pair_investment_amount,
+        pair_max_position_ratio,
+        total_capital,
+        lot_size,
+        slippage_bps,
+        commission_bps,
+        final_equity_out,
+        max_drawdown_pct_out,
+        invested_cash_out,
+    )
+
+
+def _simulate_dca(
+    close,
+    schedule_positions,
+    total_capital,
+    investment_amount,
+    max_position_ratio,
+    lot_size,
+    slippage_bps,
+    commission_bps,
+    units_out,
+    execution_price_out,
+    cash_required_out,
+    fee_out,
+    slippage_out,
+):
+    """`simulate_dca` 的编译实现。
+
+    计算顺序与 `dca.py` 里的成交价、手续费和整手取整函数逐步一致，
+    保证编译前后结果逐位相同。
+    """
+    slippage = max(slippage_bps, 0.0)
+    commission = max(commission_bps, 0.0)
+    cash = total_capital
+    position_units = 0
+    for event_index in range(schedule_positions.shape[0]):
+        close_price = close[schedule_positions[event_index]]
+        units, execution_price, cash_required, fee = _dca_order(
+            close_price,
+            cash,
+            position_units,
+            total_capital,
+            investment_amount,
+            max_position_ratio,
+            lot_size,
+            slippage,
+            commission,
+        )
+        cash -= cash_required
+        position_units += units
+        units_out[event_index] = units
+        execution_price_out[event_index] = execution_price
+        cash_required_out[event_index] = cash_required
+        fee_out[event_index] = fee
+        slippage_out[event_index] = units * max(execution_price - close_price, 0.0) if units > 0 else 0.0
+    return cash
+
+
+def _sweep_dca_windows(
+    close,
+    schedule_positions,
+    pair_window_start,
+    pair_window_end,
+    pair_schedule_start,
+    pair_schedule_end,
+    pair_investment_amount,
+    pair_max_position_ratio,
+    total_capital,
+    lot_size,
+    slippage_bps,
+    commission_bps,
+    final_equity_out,
+    max_drawdown_pct_out,
+    invested_cash_out,
+):
+    """`sweep_dca_windows` 的编译实现；组合之间不共享状态，可以直接用 `prange` 分到多个线程。"""
+    slippage = max(slippage_bps, 0.0)
+    commission = max(commission_bps, 0.0)
+    for pair_index in prange(pair_window_start.shape[0]):
+        cash = total_capital
+        position_units = 0
+        invested_cash = 0.0
+        peak_equity = total_capital
+        max_drawdown_pct = 0.0
+        equity = total_capital
+        next_event = pair_schedule_start[pair_index]
+        event_end = pair_schedule_end[pair_index]
+        for bar_index in range(pair_window_start[pair_index], pair_window_end[pair_index]):
+            close_price = close[bar_index]
+            if next_event < event_end and schedule_positions[next_event] == bar_index:
+                next_event += 1
+                units, _, cash_required, _ = _dca_order(
+                    close_price,
+                    cash,
+                    position_units,
+                    total_capital,
+                    pair_investment_amount[pair_index],
+                    pair_max_position_ratio[pair_index],
+                    lot_size,
+                    slippage,
+                    commission,
+                )
+                if units > 0:
+                    cash -= cash_required
+                    position_units += units
+                    invested_cash += cash_required
+            equity = cash + position_units * close_price
+            peak_equity = max(peak_equity, equity)
+            drawdown_pct = (equity / peak_equity - 1) * 100 if peak_equity != 0 else 0.0
+            max_drawdown_pct = min(max_drawdown_pct, drawdown_pct)
+        final_equity_out[pair_index] = equity
+        max_drawdown_pct_out[pair_index] = max_drawdown_pct
+        invested_cash_out[pair_index] = invested_cash
+
+
+# 下标都来自调用方按行情长度生成的位置数组，显式关闭越界检查，避免 NUMBA_BOUNDSCHECK
+# 调试开关把检查带进热循环。不开 fastmath：内核承诺与 Python 口径逐位一致，
+# 重排浮点运算或合成 FMA 都会打破这一点。
+_KERNEL_SPECS = {
+    "simulate_dca": (_simulate_dca, _simulate_dca_signature, {"boundscheck": False}),
+    "sweep_dca_windows": (
+        _sweep_dca_windows,
+        _sweep_dca_windows_signature,
+        {"parallel": True, "boundscheck": False},
+    ),
+}
@@ -25,7 +25,7 @@ from strategy_studio.settings import (
     build_execution_config,
 )
 from strategy_studio.strategy.metrics import compute_rebound_score, summarize_walk_forward_runs
-from strategy_studio.strategy.sampling import build_walk_forward_windows, format_timestamp
+from strategy_studio.strategy.sampling import build_walk_forward_windows, format_timestamp, format_timestamp_index
 
 
 TOTAL_CAPITAL = 200000.0
@@ -234,12 +234,10 @@ def _fade_filter_active(row: pd.Series, params: dict[str, object]) -> bool:
     return float(row.get("UpperShadowPct", 0.0)) >= float(params.get("fade_filter_upper_shadow_pct", 999.0))
 
 
-def _build_equity_curve(history: list[dict[str, object]]) -> pd.DataFrame:
-    frame = pd.DataFrame(history)
-    if frame.empty:
+def _build_equity_curve(index: pd.DatetimeIndex, equity: np.ndarray) -> pd.DataFrame:
+    if len(equity) == 0:
         return pd.DataFrame()
-    frame["Date"] = pd.to_datetime(frame["Date"])
-    curve = frame.set_index("Date")[["Equity"]].copy()
+    curve = pd.DataFrame({"Equity": equity}, index=pd.DatetimeIndex(np.asarray(index, dtype="datetime64[ns]"), name="Date"))
     curve["PeakEquity"] = curve["Equity"].cummax()
     curve["DrawdownPct"] = np.where(curve["PeakEquity"] > 0, curve["Equity"] / curve["PeakEquity"] - 1, 0.0)
     return curve
@@ -276,7 +274,6 @@ def run_rebound_backtest(
     max_position_ratio_used = 0.0
     trade_rows: list[dict[str, object]] = []
     event_rows: list[dict[str, object]] = []
-    history_rows: list[dict[str, object]] = []
     blocked_bars_remaining = 0
     filter_blocked_events = 0
     stop_loss_events = 0
@@ -287,9 +284,23 @@ def run_rebound_backtest(
     param_signature = _build_parameter_key(strategy_kind, params)
     annual_factor = _annualization_factor(features.index)
 
+    # 入场判断仍按行读取特征，上一根 K 线直接沿用上一轮迭代的行，不再逐根 `iloc`；明细列循环后一次组装。
+    close_values = features["Close"].to_numpy(dtype=np.float64)
+    bar_count = len(features)
+    position_units_values = np.zeros(bar_count, dtype=np.int64)
+    entry_price_values = np.zeros(bar_count, dtype=np.float64)
+    entry_cost_values = np.zeros(bar_count, dtype=np.float64)
+    realized_profit_values = np.zeros(bar_count, dtype=np.float64)
+    market_value_values = np.zeros(bar_count, dtype=np.float64)
+    position_ratio_values = np.zeros(bar_count, dtype=np.float64)
+    max_position_ratio_values = np.zeros(bar_count, dtype=np.float64)
+    transaction_cost_values = np.zeros(bar_count, dtype=np.float64)
+    slippage_cost_values = np.zeros(bar_count, dtype=np.float64)
+    equity_values = np.zeros(bar_count, dtype=np.float64)
+
+    previous_row: pd.Series | None = None
     for index, (timestamp, row) in enumerate(features.iterrows()):
         close_price = float(row["Close"])
-        previous_row = features.iloc[index - 1] if index > 0 else None
 
         if strategy_kind == "minute_rebound_with_fade_filter" and _fade_filter_active(row, params):
             blocked_bars_remaining = max(blocked_bars_remaining, int(params["fade_filter_block_bars"]))
@@ -439,37 +450,47 @@ def run_rebound_backtest(
         max_drawdown_pct = min(max_drawdown_pct, drawdown_pct)
         position_ratio = market_value / total_capital if total_capital else 0.0
         max_position_ratio_used = max(max_position_ratio_used, position_ratio)
-        effective_cost = entry_execution_price if position_units > 0 else 0.0
-        unrealized_pnl = position_units * (close_price - entry_execution_price) if position_units > 0 else 0.0
-        history_rows.append(
-            {
-                "Date": format_timestamp(timestamp),
-                "Close": close_price,
-                "PositionUnits": position_units,
-                "OpenGridLevels": 1 if position_units > 0 else 0,
-                "GrossCost": position_units * entry_execution_price + entry_cost if position_units > 0 else 0.0,
-                "RealizedGridProfit": realized_profit,
-                "ClosedGridNetProfit": realized_profit,
-                "UnrealizedPnl": unrealized_pnl,
-                "EffectiveCost": effective_cost,
-                "CostReductionPct": 0.0,
-                "MarketValue": market_value,
-                "OpenGridMarketValue": market_value,
-                "PositionRatioPct": position_ratio * 100,
-                "MaxCapitalUsedPct": max_position_ratio_used * 100,
-                "TransactionCostCumulative": transaction_cost_total,
-                "SlippageCostCumulative": slippage_cost_total,
-                "MaxPositionRatioUsedPct": max_position_ratio_used * 100,
-                "Equity": equity,
-            }
-        )
+
+        position_units_values[index] = position_units
+        entry_price_values[index] = entry_execution_price
+        entry_cost_values[index] = entry_cost
+        realized_profit_values[index] = realized_profit
+        market_value_values[index] = market_value
+        position_ratio_values[index] = position_ratio
+        max_position_ratio_values[index] = max_position_ratio_used
+        transaction_cost_values[index] = transaction_cost_total
+        slippage_cost_values[index] = slippage_cost_total
+        equity_values[index] = equity
         if blocked_bars_remaining > 0:
             blocked_bars_remaining -= 1
-
-    history = pd.DataFrame(history_rows)
+        previous_row = row
+
+    holding = position_units_values > 0
+    history = pd.DataFrame(
+        {
+            "Date": format_timestamp_index(features.index),
+            "Close": close_values,
+            "PositionUnits": position_units_values,
+            "OpenGridLevels": holding.astype(np.int64),
+            "GrossCost": np.where(holding, position_units_values * entry_price_values + entry_cost_values, 0.0),
+            "RealizedGridProfit": realized_profit_values,
+            "ClosedGridNetProfit": realized_profit_values,
+            "UnrealizedPnl": np.where(holding, position_units_values * (close_values - entry_price_values), 0.0),
+            "EffectiveCost": np.where(holding, entry_price_values, 0.0),
+            "CostReductionPct": np.zeros(bar_count, dtype=np.float64),
+            "MarketValue": market_value_values,
+            "OpenGridMarketValue": market_value_values,
+            "PositionRatioPct": position_ratio_values * 100,
+            "MaxCapitalUsedPct": max_position_ratio_values * 100,
+            "TransactionCostCumulative": transaction_cost_values,
+            "SlippageCostCumulative": slippage_cost_values,
+            "MaxPositionRatioUsedPct": max_position_ratio_values * 100,
+            "Equity": equity_values,
+        }
+    )
     events = pd.DataFrame(event_rows)
     trades = pd.DataFrame(trade_rows)
-    equity_curve = _build_equity_curve(history_rows)
+    equity_curve = _build_equity_curve(features.index, equity_values)
     final_equity = float(history.iloc[-1]["Equity"]) if not history.empty else total_capital
     return_pct = (final_equity / total_capital - 1) * 100 if total_capital else 0.0
     benchmark_metrics = _build_benchmark_metrics(data, total_capital, lot_size, execution)
@@ -7,6 +7,7 @@ CLI 和前端可以围绕这些元数据收敛，避免继续在多个模块里
 """
 
 from dataclasses import dataclass
+from math import isqrt
 from typing import Callable
 
 import pandas as pd
@@ -50,6 +51,7 @@ from strategy_studio.settings import (
     DCA_FREQUENCIES,
     DCA_INVESTMENT_AMOUNTS,
     DCA_MAX_POSITION_RATIOS,
+    DEFAULT_SEARCH_MODE,
     INTRADAY_GRID_COUNTS,
     INTRADAY_SPACINGS,
     INTRADAY_TAKE_PROFITS,
@@ -61,6 +63,7 @@ from strategy_studio.settings import (
     MINUTE_REBOUND_RSI_ENTRIES,
     MINUTE_REBOUND_STOP_LOSSES,
     MINUTE_REBOUND_TAKE_PROFITS,
+    SEARCH_MODES,
     ExecutionConfig,
 )
 from strategy_studio.strategy.bollinger import optimize_bollinger_reversion_parameters, run_bollinger_reversion_backtest
@@ -82,6 +85,8 @@ class ParameterFieldSpec:
     key: str
     label: str
     kind: ParameterKind
+    # 参数空间键与 `extract_params` 输出键不一致时填写后者，例如网格的 spacings -> grid_spacing_pct。
+    param_key: str | None = None
 
 
 @dataclass(frozen=True)
@@ -444,9 +449,9 @@ STRATEGY_SPECS: dict[str, StrategySpec] = {
         signal_family="grid",
         supported_intervals=None,
         parameter_fields=(
-            ParameterFieldSpec("spacings", "网格间距", "float"),
-            ParameterFieldSpec("grid_counts", "网格层数", "int"),
-            ParameterFieldSpec("take_profits", "止盈比例", "float"),
+            ParameterFieldSpec("spacings", "网格间距", "float", param_key="grid_spacing_pct"),
+            ParameterFieldSpec("grid_counts", "网格层数", "int", param_key="grid_count"),
+            ParameterFieldSpec("take_profits", "止盈比例", "float", param_key="take_profit_pct"),
         ),
         default_parameter_space=_grid_parameter_space,
         optimize=_optimize_grid,
@@ -643,3 +648,103 @@ def compare_strategy_kinds(interval: str) -> list[str]:
     if interval == "1d":
         return ["grid", "dca", "ma_cross", "macd_trend", "donchian_breakout", "volume_breakout", "bollinger_reversion", "daily_rebound"]
     return ["grid", "minute_rebound", "minute_rebound_with_fade_filter"]
+
+
+# 各策略寻参函数统一按这组列降序排出最优参数，两阶段合并结果时沿用同一口径。
+_RESULT_RANKING_COLUMNS = ["RobustScore", "WalkForwardScoreMin", "WalkForwardPositiveWindowRatio", "Score", "ReturnPct"]
+
+
+def optimize_strategy(
+    strategy_kind: str,
+    *,
+    parameter_space: dict[str, object],
+    search_mode: str = DEFAULT_SEARCH_MODE,
+    **kwargs: object,
+) -> tuple[pd.DataFrame, dict[str, object]]:
+    """按搜索方式执行样本内寻参。
+
+    - `exhaustive`：穷举整个参数空间，是默认口径。
+    - `coarse_to_fine`：先在每个数值维度上等距抽样做粗搜，再只在粗搜最优点
+      相邻的取值之间细搜。收益面在各维度上大致单峰时结果与穷举一致，
+      参数取值越密节省越多；字符串维度没有“相邻”概念，两阶段都保留全部取值。
+      数值维度会先按数值升序重排，用户模板传入乱序列表时“相邻”仍指数值上的邻居。
+    """
+    spec = get_strategy_spec(strategy_kind)
+    if search_mode not in SEARCH_MODES:
+        raise ValueError(f"未知寻参方式: {search_mode}；可选 {', '.join(SEARCH_MODES)}")
+    if search_mode != "coarse_to_fine":
+        return spec.optimize(parameter_space=parameter_space, **kwargs)
+
+    parameter_space = _sort_numeric_dimensions(spec, parameter_space)
+    coarse_positions = _coarse_search_positions(spec, parameter_space)
+    if coarse_positions is None:
+        return spec.optimize(parameter_space=parameter_space, **kwargs)
+
+    coarse_space = {
+        key: [parameter_space[key][position] for position in positions] for key, positions in coarse_positions.items()
+    }
+    coarse_results, coarse_best = spec.optimize(parameter_space=coarse_space, **kwargs)
+    best_params = spec.extract_params(coarse_best["summary"])
+    fine_space = dict(parameter_space)
+    for field in spec.parameter_fields:
+        positions = coarse_positions[field.key]
+        if len(positions) == len(parameter_space[field.key]):
+            continue
+        slot = _nearest_coarse_slot(parameter_space[field.key], positions, best_params[field.param_key or field.key])
+        lower = positions[slot - 1] + 1 if slot > 0 else 0
+        upper = positions[slot + 1] if slot + 1 < len(positions) else len(parameter_space[field.key])
+        fine_space[field.key] = parameter_space[field.key][lower:upper]
+    fine_results, fine_best = spec.optimize(parameter_space=fine_space, **kwargs)
+
+    # 粗搜最优点也在细搜范围内，两阶段合并后按统一排序取最优；稳定排序保证并列时结果可复现。
+    merged = pd.concat([coarse_results, fine_results], ignore_index=True)
+    identities = pd.Series([_param_identity(spec, row) for row in merged.to_dict(orient="records")])
+    results = (
+        merged.loc[~identities.duplicated().to_numpy()]
+        .sort_values(_RESULT_RANKING_COLUMNS, ascending=False, kind="stable")
+        .reset_index(drop=True)
+    )
+    best_runs = {_param_identity(spec, run["summary"]): run for run in (fine_best, coarse_best)}
+    return results, best_runs[_param_identity(spec, results.iloc[0].to_dict())]
+
+
+def _sort_numeric_dimensions(spec: StrategySpec, parameter_space: dict[str, object]) -> dict[str, object]:
+    """把数值维度按数值升序重排并去重，粗搜位置和细搜区间都依赖下标顺序等于数值顺序。"""
+    ordered = dict(parameter_space)
+    for field in spec.parameter_fields:
+        if field.kind == "string":
+            continue
+        ordered[field.key] = sorted(dict.fromkeys(parameter_space[field.key]), key=float)
+    return ordered
+
+
+def _coarse_search_positions(spec: StrategySpec, parameter_space: dict[str, object]) -> dict[str, list[int]] | None:
+    """为每个维度挑出粗搜位置；所有维度都无法再抽稀时返回 None，直接穷举。
+
+    步长取 `isqrt(n)`（至少 2），粗搜约 `n / 步长` 个点、细搜不超过 `2 * 步长 - 1` 个点，
+    两者之和在步长接近 `sqrt(n)` 时最小；首尾取值始终保留，避免最优点落在边界外。
+    """
+    positions: dict[str, list[int]] = {}
+    reduced = False
+    for field in spec.parameter_fields:
+        values = parameter_space[field.key]
+        if field.kind == "string" or len(values) < 3:
+            positions[field.key] = list(range(len(values)))
+            continue
+        stride = max(2, isqrt(len(values)))
+        selected = list(range(0, len(values), stride))
+        if selected[-1] != len(values) - 1:
+            selected.append(len(values) - 1)
+        positions[field.key] = selected
+        reduced = True
+    return positions if reduced else None
+
+
+def _nearest_coarse_slot(values: list[object], positions: list[int], target: object) -> int:
+    """定位粗搜最优参数落在哪个粗搜位置；摘要里的百分比换算可能带来浮点误差，按最近值匹配。"""
+    return min(range(len(positions)), key=lambda slot: abs(float(values[positions[slot]]) - float(target)))
+
+
+def _param_identity(spec: StrategySpec, summary: dict[str, object]) -> tuple[object, ...]:
+    """用 `extract_params` 的取值标识一组参数；网格和定投的摘要里没有 ParamSignature。"""
+    return tuple(value if isinstance(value, str) else float(value) for value in spec.extract_params(summary).values())
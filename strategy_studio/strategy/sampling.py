@@ -40,6 +40,33 @@ def format_timestamp(timestamp: pd.Timestamp) -> str:
     return normalized.strftime("%Y-%m-%d")
 
 
+def format_timestamp_index(index: pd.Index) -> np.ndarray:
+    """批量格式化时间索引，逐元素口径与 `format_timestamp` 保持一致。
+
+    向量化回测会一次性生成整列快照，这里避免再逐个装箱 Timestamp。
+    """
+    normalized = pd.DatetimeIndex(index)
+    has_time = (normalized.hour != 0) | (normalized.minute != 0) | (normalized.second != 0)
+    formatted = np.where(
+        has_time,
+        normalized.strftime("%Y-%m-%d %H:%M:%S"),
+        normalized.strftime("%Y-%m-%d"),
+    )
+    return formatted.astype(object)
+
+
+def resolve_sample_start(
+    validation_start: str = DEFAULT_VALIDATION_START,
+    lookback_days: int = DEFAULT_LOOKBACK_DAYS,
+) -> pd.Timestamp:
+    """返回日线样本内区间的起点；更早的行情不会进入寻参和验证。
+
+    数据库读取行情时可以据此把起止条件下推到查询里，不必先取全量再切片。
+    """
+    sample_end_ts = pd.Timestamp(validation_start) - pd.Timedelta(days=1)
+    return sample_end_ts - pd.Timedelta(days=lookback_days)
+
+
 def build_sample_window(
     data: pd.DataFrame,
     validation_start: str = DEFAULT_VALIDATION_START,
@@ -48,7 +75,7 @@ def build_sample_window(
     """构建日线样本内/样本外窗口摘要。"""
     validation_timestamp = pd.Timestamp(validation_start)
     sample_end_ts = validation_timestamp - pd.Timedelta(days=1)
-    sample_start_ts = sample_end_ts - pd.Timedelta(days=lookback_days)
+    sample_start_ts = resolve_sample_start(validation_start, lookback_days)
     window = data.loc[sample_start_ts:sample_end_ts]
     if window.empty:
         raise ValueError("样本内区间为空，无法构建样本窗口。")
@@ -92,12 +119,15 @@ def build_intraday_sample_window(
     )
 
 
-def build_walk_forward_windows(
+def build_walk_forward_bounds(
     data: pd.DataFrame,
     window_count: int = DEFAULT_WALK_FORWARD_WINDOW_COUNT,
     min_window_size: int = DEFAULT_WALK_FORWARD_MIN_WINDOW_SIZE,
-) -> list[pd.DataFrame]:
-    """把样本内区间按时间顺序拆成多个连续窗口。"""
+) -> list[tuple[int, int]]:
+    """返回 walk-forward 窗口的整数位置区间 `[start, end)`。
+
+    数值内核直接按位置切收盘价数组，不需要为每个窗口复制 DataFrame。
+    """
     if data.empty:
         raise ValueError("样本为空，无法拆分稳健性窗口。")
     if window_count < 1:
@@ -105,21 +135,30 @@ def build_walk_forward_windows(
     if min_window_size < 5:
         raise ValueError("min_window_size 过小，至少应保留 5 根 K 线。")
     if len(data) < min_window_size * 2:
-        return [data.copy()]
+        return [(0, len(data))]
 
     max_window_count = max(1, len(data) // min_window_size)
     effective_count = min(window_count, max_window_count)
     if effective_count <= 1:
-        return [data.copy()]
+        return [(0, len(data))]
 
     split_points = np.linspace(0, len(data), effective_count + 1, dtype=int)
-    windows: list[pd.DataFrame] = []
-    for start_index, end_index in zip(split_points[:-1], split_points[1:]):
-        if end_index - start_index < min_window_size:
-            continue
-        windows.append(data.iloc[start_index:end_index].copy())
+    bounds = [
+        (int(start_index), int(end_index))
+        for start_index, end_index in zip(split_points[:-1], split_points[1:])
+        if end_index - start_index >= min_window_size
+    ]
+    return bounds or [(0, len(data))]
+
 
-    return windows or [data.copy()]
+def build_walk_forward_windows(
+    data: pd.DataFrame,
+    window_count: int = DEFAULT_WALK_FORWARD_WINDOW_COUNT,
+    min_window_size: int = DEFAULT_WALK_FORWARD_MIN_WINDOW_SIZE,
+) -> list[pd.DataFrame]:
+    """把样本内区间按时间顺序拆成多个连续窗口。"""
+    bounds = build_walk_forward_bounds(data, window_count=window_count, min_window_size=min_window_size)
+    return [data.iloc[start_index:end_index].copy() for start_index, end_index in bounds]
 
 
 def split_in_sample_and_validation(
@@ -26,6 +26,7 @@ class BacktestRequestModel(BaseModel):
     jobs: int | None = Field(default=None, ge=1)
     template_id: int | None = None
     parameter_space: dict[str, object] | None = None
+    search_mode: str | None = Field(default=None, description="可选：exhaustive（默认，穷举）或 coarse_to_fine（先粗搜再细搜）")
 
 
 class StrategyTemplateCreateModel(BaseModel):
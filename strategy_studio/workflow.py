@@ -26,6 +26,7 @@ from strategy_studio.settings import (
     DAILY_TAKE_PROFITS,
     DEFAULT_LOOKBACK_DAYS,
     DEFAULT_JOBS,
+    DEFAULT_SEARCH_MODE,
     DEFAULT_VALIDATION_RATIO,
     DEFAULT_VALIDATION_START,
     DEFAULT_WALK_FORWARD_MIN_WINDOW_SIZE,
@@ -42,6 +43,7 @@ from strategy_studio.settings import (
     INTRADAY_SPACINGS,
     INTRADAY_TAKE_PROFITS,
     ExecutionConfig,
+    SearchMode,
     StrategyKind,
     build_execution_config,
 )
@@ -50,6 +52,7 @@ from strategy_studio.strategy.index_grid import run_index_grid_backtest
 from strategy_studio.strategy.registry import (
     default_parameter_space_for_strategy,
     get_strategy_spec,
+    optimize_strategy,
     validate_strategy_interval,
 )
 from strategy_studio.strategy.rebound import optimize_rebound_parameters, run_rebound_backtest
@@ -205,11 +208,11 @@ def run_optimization_workflow(
     parameter_space: dict[str, object] | None = None,
     data: pd.DataFrame | None = None,
     lot_rule: LotSizeRule | None = None,
+    search_mode: SearchMode = DEFAULT_SEARCH_MODE,
 ) -> dict[str, object]:
     """执行样本内参数搜索并返回结构化结果。"""
     started_at = perf_counter()
     validate_strategy_interval(strategy_kind, "1d")
-    spec = get_strategy_spec(strategy_kind)
     execution = execution_config or build_execution_config("research")
     resolved_symbol = _resolve_symbol(symbol, data_path)
     effective_lot_rule = lot_rule or resolve_lot_size_rule(resolved_symbol)
@@ -228,16 +231,19 @@ def run_optimization_workflow(
         take_profits=take_profits,
     )
     logger.info(
-        "[1/2] 开始执行日线样本内寻参: strategy={} symbol={} data={} rows={} combinations={}",
+        "[1/2] 开始执行日线样本内寻参: strategy={} symbol={} data={} rows={} combinations={} search={}",
         strategy_kind,
         effective_lot_rule.symbol,
         data_path,
         len(price_frame),
         _count_parameter_space_candidates(resolved_parameter_space),
+        search_mode,
     )
-    results, best_run = spec.optimize(
+    results, best_run = optimize_strategy(
+        strategy_kind,
         data=in_sample,
         parameter_space=resolved_parameter_space,
+        search_mode=search_mode,
         scenario_name="in_sample",
         symbol=effective_lot_rule.symbol,
         market=effective_lot_rule.market,
@@ -344,6 +350,7 @@ def run_full_workflow(
     parameter_space: dict[str, object] | None = None,
     data: pd.DataFrame | None = None,
     lot_rule: LotSizeRule | None = None,
+    search_mode: SearchMode = DEFAULT_SEARCH_MODE,
 ) -> dict[str, object]:
     """串联样本内寻参和样本外验证。
 
@@ -371,6 +378,7 @@ def run_full_workflow(
         parameter_space=parameter_space,
         data=price_frame,
         lot_rule=effective_lot_rule,
+        search_mode=search_mode,
     )
     best_summary = optimization["best_run"]["summary"]
     spec = get_strategy_spec(strategy_kind)
@@ -421,11 +429,11 @@ def run_minute_optimization_workflow(
     parameter_space: dict[str, object] | None = None,
     data: pd.DataFrame | None = None,
     lot_rule: LotSizeRule | None = None,
+    search_mode: SearchMode = DEFAULT_SEARCH_MODE,
 ) -> dict[str, object]:
     """执行分钟线样本内参数搜索并返回结构化结果。"""
     started_at = perf_counter()
     validate_strategy_interval(strategy_kind, interval)
-    spec = get_strategy_spec(strategy_kind)
     execution = execution_config or build_execution_config("research")
 
     resolved_symbol = _resolve_symbol(symbol, data_path)
@@ -444,16 +452,19 @@ def run_minute_optimization_workflow(
         take_profits=take_profits,
     )
     logger.info(
-        "[1/2] 开始执行分钟线样本内寻参: strategy={} symbol={} data={} rows={} combinations={}",
+        "[1/2] 开始执行分钟线样本内寻参: strategy={} symbol={} data={} rows={} combinations={} search={}",
         strategy_kind,
         effective_lot_rule.symbol,
         data_path,
         len(price_frame),
         _count_parameter_space_candidates(resolved_parameter_space),
+        search_mode,
     )
-    results, best_run = spec.optimize(
+    results, best_run = optimize_strategy(
+        strategy_kind,
         data=in_sample,
         parameter_space=resolved_parameter_space,
+        search_mode=search_mode,
         scenario_name="minute_in_sample",
         symbol=effective_lot_rule.symbol,
         market=effective_lot_rule.market,
@@ -551,6 +562,7 @@ def run_minute_full_workflow(
     parameter_space: dict[str, object] | None = None,
     data: pd.DataFrame | None = None,
     lot_rule: LotSizeRule | None = None,
+    search_mode: SearchMode = DEFAULT_SEARCH_MODE,
 ) -> dict[str, object]:
     """串联分钟线样本内寻参和样本外验证。"""
     started_at = perf_counter()
@@ -574,6 +586,7 @@ def run_minute_full_workflow(
         parameter_space=parameter_space,
         data=price_frame,
         lot_rule=effective_lot_rule,
+        search_mode=search_mode,
     )
     best_summary = optimization["best_run"]["summary"]
     spec = get_strategy_spec(strategy_kind)
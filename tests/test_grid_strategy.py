@@ -1,8 +1,14 @@
+import os
+import subprocess
+import sys
 import tempfile
 import unittest
+from dataclasses import replace
+from itertools import product
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import numpy as np
 import pandas as pd
 
 import strategy_studio.data.market_rules as market_rules
@@ -18,7 +24,16 @@ from strategy_studio.strategy.grid import (
     split_intraday_in_sample_and_validation,
     split_in_sample_and_validation,
 )
-from strategy_studio.strategy.dca import run_dca_backtest
+from strategy_studio.strategy.dca import (
+    _build_dca_schedule,
+    _build_window_dca_schedules,
+    optimize_dca_parameters,
+    run_dca_backtest,
+)
+from strategy_studio.strategy import kernels
+from strategy_studio.strategy.kernels import simulate_dca
+from strategy_studio.strategy.registry import STRATEGY_SPECS, optimize_strategy
+from strategy_studio.strategy.sampling import format_timestamp, resolve_sample_start
 from strategy_studio.strategy.index_grid import resolve_index_grid_spec, run_index_grid_backtest
 from strategy_studio.strategy.bollinger import run_bollinger_reversion_backtest
 from strategy_studio.strategy.donchian import run_donchian_breakout_backtest
@@ -331,6 +346,26 @@ class GridStrategyTests(unittest.TestCase):
         self.assertEqual(window.sample_start, "2025-11-03")
         self.assertEqual(window.validation_start, "2025-12-01")
 
+    def test_resolve_sample_start_trims_history_without_changing_split(self) -> None:
+        frame = build_test_frame([20.0 + index * 0.1 for index in range(80)], start="2025-09-01")
+
+        sample_start = resolve_sample_start("2025-12-01", lookback_days=30)
+        full_window, full_in_sample, full_validation = split_in_sample_and_validation(
+            frame,
+            validation_start="2025-12-01",
+            lookback_days=30,
+        )
+        trimmed_window, trimmed_in_sample, trimmed_validation = split_in_sample_and_validation(
+            frame.loc[sample_start:],
+            validation_start="2025-12-01",
+            lookback_days=30,
+        )
+
+        self.assertEqual(sample_start, pd.Timestamp("2025-10-31"))
+        self.assertEqual(trimmed_window, full_window)
+        pd.testing.assert_frame_equal(trimmed_in_sample, full_in_sample)
+        pd.testing.assert_frame_equal(trimmed_validation, full_validation)
+
     def test_split_in_sample_and_validation_no_longer_requires_drawdown_trigger(self) -> None:
         prices = [20.0, 20.5, 21.0, 21.3, 21.6, 21.9, 22.1]
         frame = build_test_frame(prices, start="2025-11-03")
@@ -543,6 +578,73 @@ class GridStrategyTests(unittest.TestCase):
         self.assertIn("retrace_sell", set(events["EventType"]))
         self.assertEqual(int(events.iloc[0]["Units"]), int(summary["BasePositionUnits"]))
 
+    def test_run_index_grid_backtest_history_tracks_armed_state_per_bar(self) -> None:
+        prices = [10.0, 9.75, 9.81, 10.06, 9.99, 10.04]
+        dates = pd.date_range(start="2026-04-01 09:30:00", periods=len(prices), freq="1min")
+        frame = pd.DataFrame(
+            {
+                "Open": prices,
+                "High": prices,
+                "Low": prices,
+                "Close": prices,
+                "Volume": [1000] * len(prices),
+            },
+            index=dates,
+        )
+
+        result = run_index_grid_backtest(
+            data=frame,
+            scenario_name="minute_index_grid_unit_test",
+            symbol="159941.SZ",
+            market="CN",
+            lot_size=100,
+            lot_size_source="unit test",
+            execution_config=build_execution_config("research", commission_bps=0, slippage_bps=0),
+        )
+
+        history = result["history"]
+        grid_units = int(result["summary"]["GridUnitsPerTrade"])
+        self.assertEqual(history["ArmedSide"].tolist(), ["", "buy", "", "sell", "", ""])
+        self.assertEqual(history["ExtremePrice"].tolist(), [10.0, 9.75, 9.81, 10.06, 9.99, 9.99])
+        self.assertEqual(history["ReferencePrice"].tolist(), [10.0, 10.0, 9.81, 9.81, 9.99, 9.99])
+        self.assertEqual(history["GridPositionUnits"].tolist(), [0, 0, grid_units, grid_units, 0, 0])
+        self.assertEqual(history["OpenGridLevels"].tolist(), [0, 0, 1, 1, 0, 0])
+        self.assertAlmostEqual(float(history["GridUnrealizedPnl"].iloc[3]), grid_units * (10.06 - 9.81))
+        self.assertEqual(list(result["equity_curve"].index), list(dates))
+
+    def test_run_index_grid_backtest_waits_through_long_armed_run(self) -> None:
+        rally = [round(10.06 + step * 0.002, 3) for step in range(300)]
+        prices = [10.0, 9.75, 9.81] + rally + [round(rally[-1] * 0.99, 3), rally[-1]]
+        dates = pd.date_range(start="2026-04-01 09:30:00", periods=len(prices), freq="1min")
+        frame = pd.DataFrame(
+            {
+                "Open": prices,
+                "High": prices,
+                "Low": prices,
+                "Close": prices,
+                "Volume": [1000] * len(prices),
+            },
+            index=dates,
+        )
+
+        result = run_index_grid_backtest(
+            data=frame,
+            scenario_name="minute_index_grid_unit_test",
+            symbol="159941.SZ",
+            market="CN",
+            lot_size=100,
+            lot_size_source="unit test",
+            execution_config=build_execution_config("research", commission_bps=0, slippage_bps=0),
+        )
+
+        history = result["history"]
+        sell_events = result["events"][result["events"]["EventType"] == "retrace_sell"]
+        trigger_position = len(prices) - 2
+        self.assertEqual(sell_events["Date"].tolist(), [dates[trigger_position].strftime("%Y-%m-%d %H:%M:%S")])
+        self.assertEqual(history["ArmedSide"].iloc[3:trigger_position].unique().tolist(), ["sell"])
+        self.assertEqual(float(history["ExtremePrice"].iloc[trigger_position - 1]), rally[-1])
+        self.assertEqual(history["ArmedSide"].iloc[trigger_position], "")
+
     def test_split_intraday_in_sample_and_validation(self) -> None:
         dates = pd.date_range(start="2026-04-01 09:30:00", periods=40, freq="15min")
         prices = [30.0, 31.0, 32.0, 33.0, 34.0, 35.0, 34.0, 33.0, 32.0, 31.0] + [30.0] * 30
@@ -644,6 +746,247 @@ class GridStrategyTests(unittest.TestCase):
         self.assertTrue((trades["Size"] < 0).all())
         self.assertTrue((events[events["EventType"] == "dca_buy"]["Units"] % 200 == 0).all())
 
+    def test_run_dca_backtest_weekly_schedule_follows_iso_week_across_new_year(self) -> None:
+        frame = build_test_frame([10.0] * 10, start="2024-12-26")
+        params = {
+            "investment_amount": 1000.0,
+            "frequency": "weekly",
+            "day_rule": "first_trading_day",
+            "max_position_ratio": 0.95,
+        }
+
+        result = run_dca_backtest(frame, "dca_iso_week", "1810.HK", "HK", 100, "unit test", params)
+
+        self.assertEqual(list(result["events"]["Date"]), ["2024-12-26", "2024-12-30", "2025-01-06"])
+
+    def test_run_dca_backtest_history_only_changes_position_on_buy_days(self) -> None:
+        prices = [10.0 + index * 0.05 for index in range(40)]
+        frame = build_test_frame(prices, start="2026-01-01")
+
+        result = run_dca_backtest(
+            data=frame,
+            scenario_name="dca_history_unit_test",
+            symbol="1810.HK",
+            market="HK",
+            lot_size=200,
+            lot_size_source="unit test",
+            params={
+                "investment_amount": 30000.0,
+                "frequency": "weekly",
+                "day_rule": "first_trading_day",
+                "max_position_ratio": 0.3,
+            },
+            execution_config=build_execution_config(
+                "research",
+                commission_bps=5,
+                slippage_bps=10,
+                max_position_ratio=0.95,
+            ),
+        )
+
+        history = result["history"]
+        events = result["events"]
+        summary = result["summary"]
+        changed_dates = set(history.loc[history["PositionUnits"].diff().fillna(history["PositionUnits"]) != 0, "Date"])
+
+        self.assertEqual(len(history), len(frame))
+        self.assertEqual(changed_dates, set(events.loc[events["EventType"] == "dca_buy", "Date"]))
+        self.assertGreater(summary["DcaSkipCount"], 0)
+        self.assertAlmostEqual(
+            float(history.iloc[-1]["Equity"]),
+            summary["TotalCapital"] - summary["DcaInvestedCash"] + float(history.iloc[-1]["MarketValue"]),
+        )
+        self.assertEqual(list(result["equity_curve"].index), list(frame.index))
+
+    def test_run_dca_backtest_sorts_unordered_input_without_mutating_it(self) -> None:
+        frame = build_test_frame([10.0 + (index % 5) * 0.3 for index in range(30)], start="2026-01-01")
+        shuffled = frame.iloc[::-1]
+        params = {
+            "investment_amount": 10000.0,
+            "frequency": "weekly",
+            "day_rule": "first_trading_day",
+            "max_position_ratio": 0.6,
+        }
+
+        ordered_result = run_dca_backtest(frame, "dca_sorted", "1810.HK", "HK", 100, "unit test", params)
+        shuffled_result = run_dca_backtest(shuffled, "dca_sorted", "1810.HK", "HK", 100, "unit test", params)
+
+        self.assertFalse(shuffled.index.is_monotonic_increasing)
+        self.assertEqual(shuffled_result["summary"]["FinalEquity"], ordered_result["summary"]["FinalEquity"])
+        self.assertEqual(shuffled_result["summary"]["EntryDate"], ordered_result["summary"]["EntryDate"])
+        pd.testing.assert_frame_equal(shuffled_result["history"], ordered_result["history"])
+
+    def test_run_dca_backtest_without_details_keeps_summary(self) -> None:
+        frame = build_test_frame([10.0 + index * 0.05 for index in range(40)], start="2026-01-01")
+        params = {
+            "investment_amount": 30000.0,
+            "frequency": "weekly",
+            "day_rule": "first_trading_day",
+            "max_position_ratio": 0.3,
+        }
+
+        detailed = run_dca_backtest(frame, "dca_detail", "1810.HK", "HK", 200, "unit test", params)
+        sweep = run_dca_backtest(frame, "dca_detail", "1810.HK", "HK", 200, "unit test", params, record_details=False)
+
+        self.assertEqual(sweep["summary"], detailed["summary"])
+        self.assertTrue(sweep["history"].empty)
+        self.assertTrue(sweep["events"].empty)
+        self.assertTrue(sweep["equity_curve"].empty)
+
+    def test_simulate_dca_kernel_rounds_to_lot_and_respects_position_cap(self) -> None:
+        close = np.array([10.0, 10.0, 20.0, 20.0], dtype=np.float64)
+        positions = np.array([0, 2, 3], dtype=np.int64)
+        units = np.empty(3, dtype=np.int64)
+        execution_prices = np.empty(3, dtype=np.float64)
+        cash_required = np.empty(3, dtype=np.float64)
+        fees = np.empty(3, dtype=np.float64)
+        slippage = np.empty(3, dtype=np.float64)
+
+        final_cash = simulate_dca(
+            close,
+            positions,
+            10000.0,
+            3000.0,
+            0.8,
+            100,
+            0.0,
+            0.0,
+            units,
+            execution_prices,
+            cash_required,
+            fees,
+            slippage,
+        )
+
+        self.assertEqual(units.tolist(), [300, 100, 0])
+        self.assertEqual(cash_required.tolist(), [3000.0, 2000.0, 0.0])
+        self.assertAlmostEqual(final_cash, 5000.0)
+
+    def test_simulate_dca_kernel_specializes_by_close_dtype(self) -> None:
+        positions = np.array([0, 2, 3], dtype=np.int64)
+
+        def run(close: np.ndarray) -> tuple[float, list[int]]:
+            units = np.empty(3, dtype=np.int64)
+            buffers = [np.empty(3, dtype=np.float64) for _ in range(4)]
+            final_cash = simulate_dca(close, positions, 10000.0, 3000.0, 0.8, 100, 0.0, 0.0, units, *buffers)
+            return final_cash, units.tolist()
+
+        prices = [10.0, 10.0, 20.0, 20.0]
+        self.assertEqual(run(np.array(prices, dtype=np.float32)), run(np.array(prices, dtype=np.float64)))
+        with self.assertRaisesRegex(ValueError, "仅支持以下收盘价 dtype"):
+            run(np.array([10, 10, 20, 20], dtype=np.int64))
+        with self.assertRaisesRegex(ValueError, "close 为 C 连续数组"):
+            run(np.array(prices * 2, dtype=np.float64)[::2])
+
+    def test_threading_layer_is_chosen_lazily_and_respects_environment(self) -> None:
+        script = (
+            "from numba import config\n"
+            "import strategy_studio.strategy.registry\n"
+            "from strategy_studio.strategy.kernels import parallel_threads\n"
+            "print(config.THREADING_LAYER_PRIORITY[0])\n"
+            "with parallel_threads(1):\n"
+            "    pass\n"
+            "print(config.THREADING_LAYER_PRIORITY[0])\n"
+        )
+        env = {key: value for key, value in os.environ.items() if not key.startswith("NUMBA_THREADING_LAYER")}
+        completed = subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+            cwd=Path(__file__).resolve().parents[1],
+        )
+
+        # 导入策略模块不改写 Numba 全局配置，首次设置并行线程数时才切到 OpenMP。
+        self.assertEqual(completed.stdout.split(), ["tbb", "omp"])
+        default_priority = ["tbb", "omp", "workqueue"]
+        with (
+            patch.dict(os.environ, {"NUMBA_THREADING_LAYER": "workqueue"}),
+            patch.object(kernels.config, "THREADING_LAYER_PRIORITY", list(default_priority)),
+        ):
+            kernels._prefer_openmp_threading_layer()
+            self.assertEqual(kernels.config.THREADING_LAYER_PRIORITY, default_priority)
+
+    def test_window_dca_schedules_match_per_window_schedule(self) -> None:
+        # 工作日样本横跨 2024/2025 年末，并挖掉元旦和若干周一、月初，覆盖周期首日休市。
+        dates = pd.bdate_range("2024-11-20", "2025-03-12")
+        holidays = pd.to_datetime(["2024-12-02", "2024-12-30", "2025-01-01", "2025-02-03", "2025-02-10"])
+        index = pd.DatetimeIndex(dates.difference(holidays))
+        position = {timestamp: offset for offset, timestamp in enumerate(index)}
+        window_bounds = [
+            (0, len(index)),
+            (position[pd.Timestamp("2024-12-18")], position[pd.Timestamp("2025-01-15")]),
+            (position[pd.Timestamp("2024-12-31")], position[pd.Timestamp("2025-01-09")]),
+            (position[pd.Timestamp("2025-01-02")], position[pd.Timestamp("2025-02-19")]),
+            (position[pd.Timestamp("2025-02-04")], len(index)),
+            (position[pd.Timestamp("2025-01-06")], position[pd.Timestamp("2025-01-06")]),
+        ]
+
+        for frequency in ("weekly", "monthly"):
+            with self.subTest(frequency=frequency):
+                batched = _build_window_dca_schedules(index, window_bounds, frequency, "first_trading_day")
+                expected = [
+                    start_index + _build_dca_schedule(index[start_index:end_index], frequency, "first_trading_day")
+                    for start_index, end_index in window_bounds
+                ]
+                self.assertEqual([positions.tolist() for positions in batched], [positions.tolist() for positions in expected])
+                self.assertTrue(all(positions.dtype == np.int64 for positions in batched))
+
+        # 2024-12-31 是 ISO 2025 第 1 周的周二，必须和 2025-01-02 归入同一周，且作为窗口首日触发。
+        weekly = _build_window_dca_schedules(index, window_bounds[2:3], "weekly", "first_trading_day")[0]
+        self.assertEqual([index[offset].strftime("%Y-%m-%d") for offset in weekly], ["2024-12-31", "2025-01-06"])
+        for build in (
+            lambda: _build_dca_schedule(index, "weekly", "last_trading_day"),
+            lambda: _build_window_dca_schedules(index, window_bounds, "weekly", "last_trading_day"),
+        ):
+            with self.assertRaisesRegex(ValueError, "仅支持 first_trading_day"):
+                build()
+
+    def test_optimize_dca_parameters_walk_forward_matches_window_backtests(self) -> None:
+        prices = [10.0 + ((index * 7) % 11 - 5) * 0.2 + index * 0.01 for index in range(90)]
+        frame = build_test_frame(prices, start="2025-01-01")
+        execution = build_execution_config("research", commission_bps=3, slippage_bps=5, max_position_ratio=0.95)
+        parameter_space = {
+            "investment_amount": [5000.0, 20000.0],
+            "frequency": ["weekly", "monthly"],
+            "day_rule": ["first_trading_day"],
+            "max_position_ratio": [0.5],
+        }
+
+        results, _ = optimize_dca_parameters(
+            data=frame,
+            parameter_space=parameter_space,
+            scenario_name="dca_wf_unit_test",
+            symbol="1810.HK",
+            market="HK",
+            lot_size=100,
+            lot_size_source="unit test",
+            execution_config=execution,
+            wf_window_count=3,
+            wf_min_window_size=20,
+            jobs=1,
+        )
+
+        for _, row in results.iterrows():
+            params = {key: row[key] for key in parameter_space}
+            window_scores = [
+                run_dca_backtest(
+                    data=window,
+                    scenario_name="dca_wf_window",
+                    symbol="1810.HK",
+                    market="HK",
+                    lot_size=100,
+                    lot_size_source="unit test",
+                    params=params,
+                    execution_config=execution,
+                )["summary"]["Score"]
+                for window in build_walk_forward_windows(frame, window_count=3, min_window_size=20)
+            ]
+            self.assertEqual(row["WalkForwardWindowCount"], 3)
+            self.assertAlmostEqual(row["WalkForwardScoreMin"], min(window_scores))
+            self.assertAlmostEqual(row["WalkForwardScoreMean"], sum(window_scores) / len(window_scores))
+
     def test_run_ma_cross_backtest_generates_cross_buy_and_sell(self) -> None:
         prices = [10.0, 9.0, 8.0, 9.0, 10.0, 11.0, 10.0, 9.0]
         frame = build_test_frame(prices, start="2025-02-03")
@@ -688,6 +1031,32 @@ class GridStrategyTests(unittest.TestCase):
         self.assertIn("ma_cross_sell", set(events["EventType"]))
         self.assertTrue((events[events["EventType"] == "ma_cross_buy"]["Units"] % 200 == 0).all())
 
+    def test_run_ma_cross_backtest_history_aligns_with_price_bars(self) -> None:
+        prices = [10.0, 9.0, 8.0, 9.0, 10.0, 11.0, 10.0, 9.0]
+        frame = build_test_frame(prices, start="2025-02-03")
+
+        result = run_ma_cross_backtest(
+            data=frame,
+            scenario_name="ma_cross_history_unit_test",
+            symbol="1810.HK",
+            market="HK",
+            lot_size=200,
+            lot_size_source="unit test",
+            params={"short_window": 2, "long_window": 3},
+            execution_config=build_execution_config("research", commission_bps=0, slippage_bps=0),
+        )
+
+        history = result["history"]
+        equity_curve = result["equity_curve"]
+        self.assertEqual(history["Date"].tolist(), [format_timestamp(timestamp) for timestamp in frame.index])
+        self.assertEqual(history["PositionUnits"].dtype, np.int64)
+        self.assertEqual(history["OpenGridLevels"].tolist(), (history["PositionUnits"] > 0).astype(int).tolist())
+        self.assertEqual(history["ShortMA"].iloc[0], 0.0)
+        self.assertTrue(history["PositionUnits"].gt(0).any())
+        self.assertTrue(equity_curve.index.equals(pd.DatetimeIndex(frame.index, name="Date")))
+        self.assertEqual(equity_curve["Equity"].tolist(), history["Equity"].tolist())
+        self.assertEqual(result["summary"]["FinalEquity"], history["Equity"].iloc[-1])
+
     def test_run_macd_trend_backtest_generates_macd_buy_and_sell(self) -> None:
         prices = [10.0, 9.0, 8.0, 9.0, 10.0, 11.0, 10.5, 9.5, 8.8]
         frame = build_test_frame(prices, start="2025-02-17")
@@ -931,6 +1300,87 @@ class GridStrategyTests(unittest.TestCase):
         self.assertLess(windows[0].index.max(), windows[1].index.min())
         self.assertLess(windows[1].index.max(), windows[2].index.min())
 
+    def test_optimize_strategy_coarse_to_fine_refines_around_coarse_best(self) -> None:
+        evaluated_spaces: list[dict[str, list[object]]] = []
+
+        def fake_optimize(parameter_space: dict[str, list[object]], **_kwargs: object) -> tuple[pd.DataFrame, dict[str, object]]:
+            evaluated_spaces.append(parameter_space)
+            rows = []
+            for spacing, grid_count, take_profit in product(
+                parameter_space["spacings"], parameter_space["grid_counts"], parameter_space["take_profits"]
+            ):
+                score = -abs(spacing - 0.045) * 100 - abs(grid_count - 6) + take_profit
+                rows.append(
+                    {
+                        "GridSpacingPct": spacing * 100,
+                        "GridCount": grid_count,
+                        "TakeProfitPct": take_profit * 100,
+                        "RobustScore": score,
+                        "WalkForwardScoreMin": score,
+                        "WalkForwardPositiveWindowRatio": 1.0,
+                        "Score": score,
+                        "ReturnPct": score,
+                    }
+                )
+            results = pd.DataFrame(rows).sort_values("RobustScore", ascending=False).reset_index(drop=True)
+            return results, {"summary": results.iloc[0].to_dict()}
+
+        spacings = [round(0.01 + index * 0.005, 3) for index in range(15)]
+        parameter_space = {"spacings": spacings, "grid_counts": [4, 5, 6, 7, 8], "take_profits": [0.03, 0.05]}
+        with patch.dict(STRATEGY_SPECS, {"grid": replace(STRATEGY_SPECS["grid"], optimize=fake_optimize)}):
+            optimize_strategy("grid", parameter_space=parameter_space)
+            self.assertEqual(evaluated_spaces, [parameter_space])
+            evaluated_spaces.clear()
+
+            results, best_run = optimize_strategy("grid", parameter_space=parameter_space, search_mode="coarse_to_fine")
+
+        self.assertEqual(len(evaluated_spaces), 2)
+        self.assertEqual(evaluated_spaces[0]["spacings"], [0.01, 0.025, 0.04, 0.055, 0.07, 0.08])
+        self.assertEqual(evaluated_spaces[0]["grid_counts"], [4, 6, 8])
+        self.assertEqual(evaluated_spaces[1]["spacings"], [0.03, 0.035, 0.04, 0.045, 0.05])
+        self.assertEqual(evaluated_spaces[1]["grid_counts"], [5, 6, 7])
+        self.assertEqual(evaluated_spaces[1]["take_profits"], [0.03, 0.05])
+        self.assertAlmostEqual(float(best_run["summary"]["GridSpacingPct"]), 4.5)
+        self.assertEqual(int(best_run["summary"]["GridCount"]), 6)
+        self.assertAlmostEqual(float(best_run["summary"]["TakeProfitPct"]), 5.0)
+        # 两阶段共评估 36 + 30 组，重叠的组合只保留一行，仍远少于穷举的 150 组。
+        self.assertEqual(len(results), 64)
+        self.assertTrue(results["RobustScore"].is_monotonic_decreasing)
+
+        with self.assertRaisesRegex(ValueError, "未知寻参方式"):
+            optimize_strategy("grid", parameter_space=parameter_space, search_mode="random")
+
+    def test_optimize_strategy_coarse_to_fine_matches_exhaustive_on_unsorted_dca_space(self) -> None:
+        # 单边上涨且无费用时，每期金额越大收益越高，收益面单峰，粗搜-细搜应与穷举选出同一组参数。
+        frame = build_test_frame([float(price) for price in np.linspace(10.0, 20.0, 500)], start="2023-01-02")
+        parameter_space = {
+            # 故意乱序：按下标抽样时粗搜会错过真正的最大值 5000。
+            "investment_amount": [3000.0, 1000.0, 5000.0, 2000.0, 4000.0, 500.0, 2500.0, 1500.0, 3500.0],
+            "frequency": ["monthly"],
+            "day_rule": ["first_trading_day"],
+            "max_position_ratio": [0.95],
+        }
+        kwargs = {
+            "data": frame,
+            "scenario_name": "dca_coarse_to_fine_unit_test",
+            "symbol": "1810.HK",
+            "market": "HK",
+            "lot_size": 100,
+            "lot_size_source": "unit test",
+            "execution_config": build_execution_config("research", commission_bps=0, slippage_bps=0),
+            "jobs": 1,
+        }
+
+        exhaustive_results, exhaustive_best = optimize_strategy("dca", parameter_space=parameter_space, **kwargs)
+        refined_results, refined_best = optimize_strategy(
+            "dca", parameter_space=parameter_space, search_mode="coarse_to_fine", **kwargs
+        )
+
+        self.assertEqual(exhaustive_best["summary"]["investment_amount"], 5000.0)
+        self.assertEqual(refined_best["summary"]["investment_amount"], exhaustive_best["summary"]["investment_amount"])
+        self.assertEqual(refined_best["summary"]["RobustScore"], exhaustive_best["summary"]["RobustScore"])
+        self.assertLess(len(refined_results), len(exhaustive_results))
+
     @patch("strategy_studio.strategy.grid.run_grid_backtest")
     def test_optimize_grid_parameters_prefers_robust_candidate(self, mock_run_grid_backtest: Mock) -> None:
         frame = build_test_frame([20.0 + index * 0.1 for index in range(60)], start="2025-01-01")
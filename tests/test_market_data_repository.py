@@ -3,11 +3,18 @@ from __future__ import annotations
 import unittest
 from datetime import datetime
 from types import SimpleNamespace
-from unittest.mock import patch
+from unittest.mock import Mock, patch
 
 import pandas as pd
+from sqlalchemy.dialects import postgresql
 
-from strategy_studio.repositories.market_data import load_backtest_price_frame_from_database, upsert_market_data_frame
+from strategy_studio.repositories.market_data import (
+    _build_backtest_price_frame,
+    clear_price_frame_cache,
+    load_backtest_price_frame_from_database,
+    upsert_market_data_frame,
+    upsert_price_frame,
+)
 
 
 class _ExecuteResult:
@@ -22,34 +29,51 @@ class _SessionDouble:
     def __init__(self, execute_results: list[list[object]]) -> None:
         self._execute_results = list(execute_results)
         self.execute_calls = 0
+        self.statements: list[object] = []
 
-    def execute(self, _statement: object) -> _ExecuteResult:
+    def execute(self, statement: object) -> _ExecuteResult:
         self.execute_calls += 1
+        self.statements.append(statement)
         return _ExecuteResult(self._execute_results.pop(0))
 
     def scalars(self, _statement: object) -> object:
         raise AssertionError("统一 K 线 upsert 不应再为统计数量预查已存在时间戳。")
 
 
-class _ScalarRows:
-    def __init__(self, rows: list[object]) -> None:
-        self._rows = rows
+class _BacktestResult:
+    def __init__(self, session: "_BacktestSessionDouble") -> None:
+        self._session = session
+
+    def one(self) -> tuple[object, ...]:
+        # 新鲜度查询：未指定时给出不会与缓存匹配的占位值。
+        return self._session.tokens.pop(0) if self._session.tokens else (object(), None, None)
 
-    def all(self) -> list[object]:
-        return list(self._rows)
+    def all(self) -> list[tuple[object, ...]]:
+        self._session.row_queries += 1
+        return list(self._session.rows_results.pop(0))
 
 
 class _BacktestSessionDouble:
-    def __init__(self, scalars_results: list[list[object]]) -> None:
-        self._scalars_results = list(scalars_results)
+    def __init__(self, rows_results: list[list[tuple[object, ...]]], tokens: list[tuple[object, ...]] | None = None) -> None:
+        self.rows_results = list(rows_results)
+        self.tokens = list(tokens or [])
+        self.row_queries = 0
+        self.statements: list[object] = []
 
-    def scalars(self, _statement: object) -> _ScalarRows:
-        return _ScalarRows(self._scalars_results.pop(0))
+    def execute(self, statement: object) -> _BacktestResult:
+        self.statements.append(statement)
+        return _BacktestResult(self)
+
+    def scalars(self, _statement: object) -> object:
+        raise AssertionError("回测行情读取应只选择 OHLCV 列，不应再水合整行 ORM 实体。")
 
 
 class MarketDataRepositoryTests(unittest.TestCase):
     """覆盖统一 K 线仓储里和前复权性能相关的关键行为。"""
 
+    def setUp(self) -> None:
+        clear_price_frame_cache()
+
     def test_upsert_market_data_frame_uses_returning_counts_without_prequery(self) -> None:
         session = _SessionDouble(
             execute_results=[
@@ -174,12 +198,68 @@ class MarketDataRepositoryTests(unittest.TestCase):
         self.assertEqual(series.last_bar_time, datetime(2026, 5, 10, 0, 0))
         self.assertIsNotNone(series.last_ingested_at)
 
+    def test_upsert_market_data_frame_builds_rows_from_columns(self) -> None:
+        session = _SessionDouble(execute_results=[[SimpleNamespace(inserted=True), SimpleNamespace(inserted=True)]])
+        series = SimpleNamespace(id=21, first_bar_time=None, last_bar_time=None, last_ingested_at=None)
+        frame = pd.DataFrame(
+            {
+                "Date": pd.to_datetime(["2026-05-28 09:31:00", "2026-05-28 09:32:00"]).tz_localize("Asia/Shanghai"),
+                "Open": [10.0, 10.3],
+                "High": [10.5, 10.7],
+                "Low": [9.8, 10.1],
+                "Close": [10.2, 10.6],
+                "Volume": pd.Series([100, 110], dtype="uint64"),
+                "Amount": pd.Series([1000.0, None], dtype=object),
+            }
+        )
+
+        upsert_market_data_frame(session, series, frame)
+
+        params = session.statements[0].compile(dialect=postgresql.dialect()).params
+        self.assertEqual(params["bar_time_m0"], datetime(2026, 5, 28, 9, 31))
+        self.assertEqual(params["high_m1"], 10.7)
+        self.assertEqual(params["adj_close_m1"], 10.6)
+        self.assertEqual(params["volume_m0"], 100)
+        self.assertIs(type(params["volume_m0"]), int)
+        self.assertEqual(params["turnover_amount_m0"], 1000.0)
+        self.assertIsNone(params["turnover_amount_m1"])
+
+    def test_upsert_frames_reject_missing_prices_before_writing(self) -> None:
+        frame = pd.DataFrame(
+            {
+                "Date": pd.to_datetime(["2026-05-28", "2026-05-29"]),
+                "Open": pd.Series([10.0, None], dtype=object),
+                "High": [10.5, 10.7],
+                "Low": [9.8, 10.1],
+                "Close": [10.2, 10.6],
+                "Volume": [100, 110],
+            }
+        )
+        session = _SessionDouble(execute_results=[])
+        series = SimpleNamespace(id=21, first_bar_time=None, last_bar_time=None, last_ingested_at=None)
+
+        with self.assertRaisesRegex(ValueError, "Open 列存在缺失或非有限价格: 共 1 行"):
+            upsert_market_data_frame(session, series, frame)
+        self.assertEqual(session.execute_calls, 0)
+        self.assertIsNone(series.last_ingested_at)
+
+        # 旧表写入要在预查已存在时间戳之前就拦下，NaN 和 inf 同样不允许入库。
+        legacy_session = SimpleNamespace(
+            scalars=Mock(side_effect=AssertionError("价格校验失败时不应再查询数据库")),
+            execute=Mock(side_effect=AssertionError("价格校验失败时不应写入数据库")),
+        )
+        for bad_value in (None, float("nan"), float("inf")):
+            with self.subTest(bad_value=bad_value):
+                dirty = frame.assign(Open=[10.0, 10.3], Close=pd.Series([10.2, bad_value], dtype=object))
+                with self.assertRaisesRegex(ValueError, "Close 列存在缺失或非有限价格"):
+                    upsert_price_frame(legacy_session, SimpleNamespace(id=5, updated_at=None), "1d", dirty)
+
     def test_load_backtest_price_frame_prefers_legacy_price_bars(self) -> None:
         session = _BacktestSessionDouble(
-            scalars_results=[
+            rows_results=[
                 [
-                    SimpleNamespace(bar_time=datetime(2026, 5, 28, 0, 0), open=10.0, high=10.5, low=9.9, close=10.2, volume=100),
-                    SimpleNamespace(bar_time=datetime(2026, 5, 29, 0, 0), open=10.3, high=10.7, low=10.1, close=10.6, volume=120),
+                    (datetime(2026, 5, 28, 0, 0), 10.0, 10.5, 9.9, 10.2, 100),
+                    (datetime(2026, 5, 29, 0, 0), 10.3, 10.7, 10.1, 10.6, 120),
                 ]
             ]
         )
@@ -196,14 +276,106 @@ class MarketDataRepositoryTests(unittest.TestCase):
         self.assertEqual(snapshot.adjustment_kind, "raw")
         self.assertListEqual(list(snapshot.frame.columns), ["Open", "High", "Low", "Close", "Volume"])
         self.assertEqual(snapshot.frame.iloc[-1]["Close"], 10.6)
+        self.assertIsInstance(snapshot.frame.index, pd.DatetimeIndex)
+        self.assertEqual(snapshot.frame.index.name, "Date")
+        self.assertEqual(str(snapshot.frame["Close"].dtype), "float64")
+        self.assertEqual(str(snapshot.frame["Volume"].dtype), "int64")
+
+    def test_load_backtest_price_frame_reuses_cached_frame_until_token_changes(self) -> None:
+        bars = [
+            (datetime(2026, 5, 28, 0, 0), 10.0, 10.5, 9.9, 10.2, 100),
+            (datetime(2026, 5, 29, 0, 0), 10.3, 10.7, 10.1, 10.6, 120),
+        ]
+        refreshed_bars = [*bars, (datetime(2026, 6, 1, 0, 0), 10.6, 11.0, 10.5, 10.9, 90)]
+        first_token = (2, datetime(2026, 5, 29, 0, 0), datetime(2026, 5, 29, 8, 0))
+        refreshed_token = (3, datetime(2026, 6, 1, 0, 0), datetime(2026, 6, 1, 8, 0))
+        session = _BacktestSessionDouble(
+            rows_results=[bars, refreshed_bars],
+            tokens=[first_token, first_token, refreshed_token],
+        )
+
+        with patch(
+            "strategy_studio.repositories.market_data.get_instrument_by_symbol",
+            return_value=SimpleNamespace(id=17, symbol="QQQ"),
+        ):
+            first = load_backtest_price_frame_from_database(session, "QQQ", "1d")
+            first.frame.loc[first.frame.index[0], "Close"] = -1.0
+            cached = load_backtest_price_frame_from_database(session, "QQQ", "1d")
+            refreshed = load_backtest_price_frame_from_database(session, "QQQ", "1d")
+
+        self.assertEqual(session.row_queries, 2)
+        self.assertEqual(cached.frame.iloc[0]["Close"], 10.2)
+        self.assertEqual(len(cached.frame), 2)
+        self.assertEqual(len(refreshed.frame), 3)
+
+    def test_load_backtest_price_frame_token_uses_instrument_revision(self) -> None:
+        bars = [(datetime(2026, 5, 28, 0, 0), 10.0, 10.5, 9.9, 10.2, 100)]
+        session = _BacktestSessionDouble(rows_results=[bars])
+
+        with patch(
+            "strategy_studio.repositories.market_data.get_instrument_by_symbol",
+            return_value=SimpleNamespace(id=17, symbol="QQQ"),
+        ):
+            load_backtest_price_frame_from_database(session, "QQQ", "1d")
+
+        token_sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+        self.assertIn("instruments.updated_at", token_sql)
+        self.assertNotIn("ingested_at", token_sql)
+
+    def test_upsert_price_frame_refreshes_instrument_revision(self) -> None:
+        statements: list[object] = []
+        session = SimpleNamespace(scalars=lambda _statement: iter(()), execute=statements.append)
+        stale_revision = datetime(2026, 1, 1, 0, 0)
+        instrument = SimpleNamespace(id=5, updated_at=stale_revision)
+        frame = pd.DataFrame(
+            {
+                "Date": pd.to_datetime(["2026-05-28", "2026-05-29"]),
+                "Open": [10.0, 10.3],
+                "High": [10.5, 10.7],
+                "Low": [9.8, 10.1],
+                "Close": [10.2, 10.6],
+                "Volume": [100, 110],
+            }
+        )
+
+        inserted_count, updated_count = upsert_price_frame(session, instrument, "1d", frame)
+
+        self.assertEqual((inserted_count, updated_count), (2, 0))
+        self.assertEqual(len(statements), 1)
+        self.assertNotEqual(instrument.updated_at, stale_revision)
+
+    def test_price_frame_cache_evicts_by_memory_budget(self) -> None:
+        bars = [
+            (datetime(2026, 5, 28, 0, 0), 10.0, 10.5, 9.9, 10.2, 100),
+            (datetime(2026, 5, 29, 0, 0), 10.3, 10.7, 10.1, 10.6, 120),
+        ]
+        frame_bytes = int(_build_backtest_price_frame(bars).memory_usage(index=True, deep=True).sum())
+        token = (2, datetime(2026, 5, 29, 0, 0), datetime(2026, 5, 29, 8, 0))
+        session = _BacktestSessionDouble(rows_results=[bars, bars, bars], tokens=[token] * 4)
+        instruments = {"QQQ": SimpleNamespace(id=17, symbol="QQQ"), "SPY": SimpleNamespace(id=18, symbol="SPY")}
+
+        with (
+            patch("strategy_studio.repositories.market_data._PRICE_FRAME_CACHE_MAX_BYTES", frame_bytes * 3 // 2),
+            patch(
+                "strategy_studio.repositories.market_data.get_instrument_by_symbol",
+                side_effect=lambda _session, symbol: instruments[symbol],
+            ),
+        ):
+            load_backtest_price_frame_from_database(session, "QQQ", "1d")
+            load_backtest_price_frame_from_database(session, "SPY", "1d")
+            load_backtest_price_frame_from_database(session, "SPY", "1d")
+            load_backtest_price_frame_from_database(session, "QQQ", "1d")
+
+        # 预算只够一份：SPY 写入时挤掉 QQQ，再次读取 QQQ 必须回库。
+        self.assertEqual(session.row_queries, 3)
 
     def test_load_backtest_price_frame_falls_back_to_unique_market_data_series(self) -> None:
         session = _BacktestSessionDouble(
-            scalars_results=[
+            rows_results=[
                 [],
                 [
-                    SimpleNamespace(bar_time=datetime(2026, 5, 28, 0, 0), open=12.0, high=12.4, low=11.8, close=12.2, volume=200),
-                    SimpleNamespace(bar_time=datetime(2026, 5, 29, 0, 0), open=12.3, high=12.8, low=12.1, close=12.7, volume=220),
+                    (datetime(2026, 5, 28, 0, 0), 12.0, 12.4, 11.8, 12.2, 200),
+                    (datetime(2026, 5, 29, 0, 0), 12.3, 12.8, 12.1, 12.7, 220),
                 ],
             ]
         )
@@ -233,7 +405,7 @@ class MarketDataRepositoryTests(unittest.TestCase):
         self.assertEqual(snapshot.frame.iloc[0]["Open"], 12.0)
 
     def test_load_backtest_price_frame_rejects_ambiguous_market_data_series(self) -> None:
-        session = _BacktestSessionDouble(scalars_results=[[]])
+        session = _BacktestSessionDouble(rows_results=[[]])
         series_rows = [
             {
                 "series_id": 41,
@@ -3753,6 +3753,10 @@ class StrategyTemplateServiceTests(unittest.TestCase):
         self.assertEqual(payload["market_data_provider"], "tdx_qfq")
         self.assertEqual(payload["market_data_adjustment_kind"], "qfq")
         self.assertEqual(payload["jobs"], 2)
+        self.assertEqual(payload["search_mode"], "exhaustive")
+
+        with self.assertRaisesRegex(ValueError, "search_mode"):
+            resolve_backtest_request_payload(SimpleNamespace(**{**vars(request), "search_mode": "random"}), session=object())
 
     def test_seed_templates_keep_unique_keys(self) -> None:
         seeds = build_seed_templates()
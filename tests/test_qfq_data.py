@@ -257,5 +257,34 @@ class QfqDataTests(unittest.TestCase):
         self.assertAlmostEqual(float(adjusted.iloc[2]["Close"]), 8.0)
 
 
+    def test_apply_qfq_segment_frame_coerces_dirty_price_columns_without_touching_input(self) -> None:
+        raw_frame = build_raw_frame()
+        raw_frame["Open"] = pd.Series(["10.0", "bad", 8.0], dtype=object)
+        raw_frame["High"] = raw_frame["High"].astype(str)
+        original = raw_frame.copy()
+        segments = pd.DataFrame(
+            [
+                {
+                    "start_date": "2024-01-02",
+                    "end_date": "2024-01-04",
+                    "adjust_a": 0.5,
+                    "adjust_b": -1.0,
+                    "status": "ready",
+                    "payload_json": {"source": "test"},
+                }
+            ]
+        )
+
+        adjusted = apply_qfq_segment_frame(raw_frame, segments)
+
+        # 文本价格按数值换算，无法解析的值变成 NaN，其余列照常复权。
+        opens = adjusted["Open"].astype("float64").tolist()
+        self.assertEqual(opens[0], 4.0)
+        self.assertTrue(pd.isna(opens[1]))
+        self.assertEqual(opens[2], 3.0)
+        self.assertEqual(adjusted["High"].astype("float64").tolist(), [4.5, 4.0, 3.5])
+        self.assertEqual(adjusted["Close"].tolist(), [4.0, 3.5, 3.0])
+        pd.testing.assert_frame_equal(raw_frame, original)
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,3 +1,5 @@
+import ast
+import importlib.util
 import json
 import re
 import unittest
@@ -6,6 +8,33 @@ from pathlib import Path
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 MARKDOWN_LINK_PATTERN = re.compile(r"\[[^\]]+\]\(([^)]+)\)")
+# 除了标准库和 loguru，项目自己的 logging_utils 也会转出 loguru 的 logger。
+LOGGING_MODULES = frozenset({"logging", "loguru", "strategy_studio.logging_utils"})
+
+
+def _find_logging_imports(source: str, package: str = "strategy_studio.strategy") -> list[str]:
+    """按语法树找出导入日志模块的语句，返回 `行号:模块名` 列表。
+
+    只看 `import` / `from ... import` 语句，注释和文档字符串里提到日志库不会误报。
+    `from` 导入同时核对 `模块.名字`，`from strategy_studio import logging_utils` 和
+    相对导入（按 `package` 解析）也算在内。
+    """
+    findings: list[str] = []
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.Import):
+            module_names = [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                base = importlib.util.resolve_name("." * node.level + base, package)
+            module_names = [base, *(f"{base}.{alias.name}" for alias in node.names)]
+        else:
+            continue
+        for module_name in module_names:
+            if any(module_name == name or module_name.startswith(f"{name}.") for name in LOGGING_MODULES):
+                findings.append(f"{node.lineno}:{module_name}")
+                break
+    return sorted(findings, key=lambda item: int(item.split(":", 1)[0]))
 
 
 class RepoContractTests(unittest.TestCase):
@@ -91,7 +120,7 @@ class RepoContractTests(unittest.TestCase):
         for config in python_configs:
             self.assertEqual(config["program"], "${workspaceFolder}/main.py")
             self.assertEqual(config["cwd"], "${workspaceFolder}")
-            self.assertIn(config["args"][0], {"api", "worker", "scheduler", "sync-now"})
+            self.assertIn(config["args"][0], {"api", "worker", "scheduler", "sync-now", "check-runtime", "batch"})
             self.assertEqual(config["console"], "integratedTerminal")
             self.assertEqual(config["env"]["PYTHONUTF8"], "1")
             self.assertEqual(config["env"]["PYTHONIOENCODING"], "utf-8")
@@ -100,6 +129,9 @@ class RepoContractTests(unittest.TestCase):
         pipeline_config = next(config for config in configurations if config["name"] == "执行 A 股统一补数链路")
         self.assertEqual(pipeline_config["args"][:3], ["sync-now", "--provider", "tdx_pipeline"])
         self.assertIn("--interval", pipeline_config["args"])
+        search_config = next(config for config in configurations if config["name"] == "执行粗搜-细搜批量回测")
+        self.assertEqual(search_config["args"][0], "batch")
+        self.assertEqual(search_config["args"][search_config["args"].index("--search-mode") + 1], "coarse_to_fine")
         frontend_config = next(config for config in configurations if config["name"] == "启动前端 Dev Server")
         self.assertEqual(frontend_config["type"], "node-terminal")
         self.assertEqual(frontend_config["cwd"], "${workspaceFolder}/frontend")
@@ -120,6 +152,53 @@ class RepoContractTests(unittest.TestCase):
             ["-NoProfile"],
         )
 
+    def test_strategy_modules_do_not_log_inside_backtests(self) -> None:
+        # 寻参会把单次回测放大成成千上万次调用，阶段日志统一由 workflow / cli 输出。
+        strategy_dir = REPO_ROOT / "strategy_studio" / "strategy"
+        module_paths = sorted(strategy_dir.rglob("*.py"))
+        self.assertTrue(module_paths)
+        for module_path in module_paths:
+            relative_path = module_path.relative_to(REPO_ROOT)
+            package = ".".join(module_path.parent.relative_to(REPO_ROOT).parts)
+            findings = _find_logging_imports(module_path.read_text(encoding="utf-8"), package=package)
+            self.assertEqual(findings, [], msg=f"{relative_path} 不应直接输出日志")
+
+    def test_logging_import_scan_ignores_comments_and_catches_from_imports(self) -> None:
+        allowed_source = "\n".join(
+            [
+                '"""这里说明为什么不用 loguru，也不 import logging。"""',
+                "# from logging import getLogger",
+                "import numpy as np",
+                "from strategy_studio.strategy import logging_rules",
+                "message = 'import logging'",
+            ]
+        )
+        self.assertEqual(_find_logging_imports(allowed_source), [])
+
+        forbidden_source = "\n".join(
+            [
+                "from logging import getLogger",
+                "import logging.handlers as handlers",
+                "import numpy as np, loguru",
+                "from loguru import logger",
+                "from strategy_studio.logging_utils import logger",
+                "from strategy_studio import logging_utils",
+                "from ..logging_utils import configure_logging",
+            ]
+        )
+        self.assertEqual(
+            _find_logging_imports(forbidden_source),
+            [
+                "1:logging",
+                "2:logging.handlers",
+                "3:loguru",
+                "4:loguru",
+                "5:strategy_studio.logging_utils",
+                "6:strategy_studio.logging_utils",
+                "7:strategy_studio.logging_utils",
+            ],
+        )
+
     def test_reports_readme_describes_database_first_boundary(self) -> None:
         content = (REPO_ROOT / "reports" / "README.md").read_text(encoding="utf-8")
         self.assertIn("数据库中的结构化记录", content)
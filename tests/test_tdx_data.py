@@ -19,6 +19,7 @@ from strategy_studio.data.tdx import (
     manifest_is_unchanged,
     normalize_day_frame,
     normalize_minute_frame,
+    parse_minute_records,
     read_day_frame,
     read_day_frame_tail,
     read_minute_frame,
@@ -278,6 +279,32 @@ class TdxDataTests(unittest.TestCase):
         self.assertEqual(normalized.iloc[0]["period"], "min5")
         self.assertEqual(normalized.iloc[1]["datetime"], "2024-05-21 10:05:00")
 
+    def test_parse_minute_records_marks_invalid_date_and_time_as_nat(self) -> None:
+        bar_times = [(2024, 2, 29, 14, 59), (2023, 2, 29, 9, 30), (2024, 5, 21, 24, 0)]
+        raw = b"".join(
+            build_legacy_minute_record(
+                year=year,
+                month=month,
+                day=day,
+                hour=hour,
+                minute=minute,
+                open_price=1000,
+                high_price=1000,
+                low_price=1000,
+                close_price=1000,
+                amount=1.0,
+                volume=1,
+            )
+            for year, month, day, hour, minute in bar_times
+        )
+
+        frame = parse_minute_records(raw, ".5")
+
+        self.assertEqual(str(frame.index.dtype), "datetime64[ns]")
+        self.assertEqual(str(frame.index[0]), "2024-02-29 14:59:00")
+        self.assertTrue(frame.index[1:].isna().all())
+        self.assertEqual(frame["volume"].dtype, "int64")
+
     def test_detect_security_type_supports_ds_categories(self) -> None:
         forex = detect_security_type(Path("10#AUDUSD.day"))
         option = detect_security_type(Path("5#A2607-C-3400.day"))
@@ -3,11 +3,13 @@ from __future__ import annotations
 import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 import pandas as pd
 
 from strategy_studio.data.tushare import (
+    TushareClient,
+    TushareClientSettings,
     build_corporate_action_records,
     load_tushare_client_settings,
     symbol_to_ts_code,
@@ -68,6 +70,41 @@ class TushareDataTests(unittest.TestCase):
         self.assertEqual(records[0]["stock_conversion_ratio"], 0.2)
         self.assertEqual(records[0]["status"], "implemented")
 
+    def test_build_corporate_action_records_falls_back_for_blank_numeric_fields(self) -> None:
+        frame = pd.DataFrame(
+            [
+                {
+                    "ts_code": "000001.SZ",
+                    "ann_date": "20240601",
+                    "div_proc": "实施",
+                    "stk_bo_rate": None,
+                    "stk_co_rate": " 0.3 ",
+                    "cash_div": 0.25,
+                    "cash_div_tax": "",
+                    "record_date": "20240612",
+                    "ex_date": "20240613",
+                },
+                {
+                    "ts_code": "000002.SZ",
+                    "ann_date": "20240601",
+                    "div_proc": "实施",
+                    "stk_bo_rate": "",
+                    "stk_co_rate": "",
+                    "cash_div": "",
+                    "cash_div_tax": "",
+                    "record_date": "20240612",
+                    "ex_date": "20240613",
+                },
+            ]
+        )
+
+        records = build_corporate_action_records(frame)
+
+        self.assertEqual([record["cash_dividend"] for record in records], [0.25, 0.0])
+        self.assertEqual([record["stock_bonus_ratio"] for record in records], [0.0, 0.0])
+        self.assertEqual([record["stock_conversion_ratio"] for record in records], [0.3, 0.0])
+        self.assertIsInstance(records[0]["cash_dividend"], float)
+
     def test_load_tushare_client_settings_reads_nested_yaml_block(self) -> None:
         with TemporaryDirectory() as temp_dir:
             config_path = Path(temp_dir) / "config.local.yaml"
@@ -99,6 +136,25 @@ class TushareDataTests(unittest.TestCase):
         self.assertEqual(settings.timeout_seconds, 12.0)
         self.assertEqual(settings.retries, 5)
 
+    def test_tushare_client_reuses_one_http_session_until_closed(self) -> None:
+        http_session = MagicMock()
+        http_session.post.return_value.content = (
+            b'{"code": 0, "data": {"fields": ["ts_code"], "items": [["600000.SH"]]}}'
+        )
+        settings = TushareClientSettings(token="demo-token", rate_limit_per_minute=60000)
+
+        with patch("strategy_studio.data.tushare.requests.Session", return_value=http_session) as session_factory:
+            with TushareClient(settings) as client:
+                first = client.query("dividend", params={"ts_code": "600000.SH"}, fields=["ts_code"])
+                second = client.query("dividend", params={"ts_code": "600000.SH"}, fields=["ts_code"])
+                http_session.close.assert_not_called()
+
+        session_factory.assert_called_once_with()
+        self.assertEqual(http_session.post.call_count, 2)
+        http_session.close.assert_called_once_with()
+        self.assertEqual(first["ts_code"].tolist(), ["600000.SH"])
+        self.assertEqual(second["ts_code"].tolist(), ["600000.SH"])
+
 
 if __name__ == "__main__":
     unittest.main()